@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the YouTube fetch paths against the offline API stand-in server.
+No network access or API key is needed.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from youtube_monitor import YouTubeMonitor, FIELD_MASKS
+from concurrent_fetcher import ConcurrentFetcher
+from quota_manager import QuotaManager
+from state_store import StateStore
+from api_replay import StandInServer, FaultConfig, SyntheticYouTube
+
+def make_monitor(server, workdir, quota, field_masks=None):
+    return YouTubeMonitor(
+        'offline-benchmark-key',
+        use_cache=False,
+        quota=quota,
+        state_store=StateStore(os.path.join(workdir, 'state.db')),
+        api_endpoint=server.url,
+        field_masks=field_masks
+    )
+
+def timed(label, func, server):
+    requests_before, bytes_before = server.request_count, server.bytes_sent
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    requests = server.request_count - requests_before
+    kilobytes = (server.bytes_sent - bytes_before) / 1024
+    print(f"{label:<38} {elapsed:8.3f}s  {requests:5d} requests  {requests / elapsed:8.1f} req/s  {kilobytes:9.1f} KiB")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark YouTube fetch paths offline')
+    parser.add_argument('--videos', type=int, default=100, help='Number of videos to fetch')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated latency per request (s)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Extra random latency per request (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 503')
+    parser.add_argument('--workers', type=int, default=16, help='ConcurrentFetcher worker count')
+    parser.add_argument('--comments', type=int, default=20, help='Comments fetched per video')
+    parser.add_argument('--no-field-masks', action='store_true',
+                        help='Request full resources instead of partial responses')
+    args = parser.parse_args()
+
+    faults = FaultConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    data = SyntheticYouTube(uploads_per_channel=max(args.videos, 50))
+
+    with StandInServer(faults=faults, data=data) as server, tempfile.TemporaryDirectory() as workdir:
+        # Default rate limit, as production monitors use; only the daily budget is lifted
+        quota = QuotaManager(os.path.join(workdir, 'quota.db'), daily_limit=10**9)
+        field_masks = {name: '' for name in FIELD_MASKS} if args.no_field_masks else None
+        monitor = make_monitor(server, workdir, quota, field_masks)
+
+        print(f"📡 Stand-in server at {server.url} "
+              f"(latency {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms, error rate {args.error_rate:.0%})")
+        bucket = quota.bucket
+        print(f"⏱️  Rate limit: {f'{bucket.rate:g} req/s, burst {bucket.capacity:g}' if bucket else 'none'}")
+        print()
+
+        videos = timed("Enumerate uploads playlist",
+                       lambda: monitor.get_channel_videos('UCbenchmarkchannel0000000', args.videos,
+                                                          use_uploads_playlist=True),
+                       server)
+        video_ids = [v['video_id'] for v in videos]
+
+        def sequential():
+            details = []
+            for video_id in video_ids:
+                video = monitor.get_video_details(video_id)
+                video['comments'] = monitor.get_video_comments(video_id, args.comments)
+                details.append(video)
+            return details
+
+        timed("Sequential details + comments", sequential, server)
+
+        fetcher = ConcurrentFetcher(
+            'offline-benchmark-key', max_workers=args.workers,
+            monitor_factory=lambda: make_monitor(server, workdir, quota, field_masks)
+        )
+        timed(f"Concurrent details + comments ({args.workers}w)",
+              lambda: fetcher.fetch_videos(video_ids, max_comments=args.comments),
+              server)
+
+        print()
+        print(f"📊 Simulated quota used: {server.quota_used:,} units")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare CPU inference modes of the summarizer (fp32, int8 dynamic
+quantization, ONNX Runtime) on latency and ROUGE agreement with fp32.
+"""
+
+import os
+import ast
+import sys
+import glob
+import json
+import argparse
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from video_summarizer import VideoSummarizer
+from cpu_inference import compare_modes, configure_threads
+
+def load_texts(paths, summarizer):
+    """Texts to summarize from analyze_video.py / main.py JSON output or plain text files"""
+    texts = []
+    for path in paths:
+        if not path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                texts.append(f.read())
+            continue
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        videos = data if isinstance(data, list) else [data.get('video_details', data)]
+        for video in videos:
+            if isinstance(video, str):
+                # analyze_video.py stores the details dict as its repr
+                video = ast.literal_eval(video)
+            texts.append(summarizer._metadata_text(video, max_comments=10))
+    return texts
+
+def print_report(title, report):
+    print(title)
+    print(f"{'mode':<8} {'total s':>9} {'s/item':>8} {'speedup':>8} {'R-1':>6} {'R-2':>6} {'R-L':>6}")
+    for row in report:
+        print(f"{row['mode']:<8} {row['seconds']:9.2f} {row['seconds_per_text']:8.2f} {row['speedup']:7.2f}x "
+              f"{row['rouge1_vs_baseline']:6.3f} {row['rouge2_vs_baseline']:6.3f} {row['rougeL_vs_baseline']:6.3f}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare fp32 and quantized CPU summarization')
+    parser.add_argument('inputs', nargs='*',
+                        help='JSON output of analyze_video.py/main.py, or .txt files (default: video_analysis_*.json)')
+    parser.add_argument('--model', default='facebook/bart-large-cnn', help='Summarization model')
+    parser.add_argument('--threads', type=int, help='torch intra-op threads')
+    parser.add_argument('--interop-threads', type=int, help='torch inter-op threads')
+    parser.add_argument('--batch-size', type=int, default=8, help='Chunks per forward pass')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per mode')
+    parser.add_argument('--onnx', action='store_true', help='Also benchmark the ONNX Runtime backend')
+    parser.add_argument('--audio', nargs='*', default=[],
+                        help='Audio/video files to also compare fp32 and int8 Whisper transcription')
+    parser.add_argument('--whisper-model', default='base', help='Whisper model for --audio')
+    parser.add_argument('--output', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    # Thread pools are process-wide and must be set before any model runs
+    configure_threads(args.threads, args.interop_threads)
+
+    modes = {
+        'fp32': VideoSummarizer(args.model, args.whisper_model, use_cache=False, quantize=False),
+        'int8': VideoSummarizer(args.model, args.whisper_model, use_cache=False, quantize=True),
+    }
+    if args.onnx:
+        onnx = VideoSummarizer(args.model, args.whisper_model, use_cache=False, backend='onnx')
+        if onnx.backend == 'onnx':
+            modes['onnx'] = onnx
+        else:
+            print("Skipping the ONNX mode")
+
+    texts = load_texts(args.inputs or sorted(glob.glob('video_analysis_*.json')), modes['fp32'])
+    if not texts and not args.audio:
+        print("❌ No input texts. Pass analyze_video.py JSON output or .txt files.")
+        sys.exit(1)
+
+    results = {}
+    if texts:
+        report = compare_modes(
+            texts,
+            {name: (lambda batch, s=summarizer: s.summarize_texts(batch, batch_size=args.batch_size))
+             for name, summarizer in modes.items()},
+            baseline='fp32', repeats=args.repeats
+        )
+        print_report(f"📝 Summarization: {len(texts)} texts, ROUGE F1 against fp32", report)
+        results['summarization'] = report
+
+    if args.audio:
+        report = compare_modes(
+            args.audio,
+            {name: (lambda paths, s=modes[name]: [s.transcribe_audio(p) for p in paths])
+             for name in ('fp32', 'int8')},
+            baseline='fp32', repeats=1
+        )
+        print_report(f"🎙️ Transcription: {len(args.audio)} files, ROUGE F1 against fp32", report)
+        results['transcription'] = report
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Report saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
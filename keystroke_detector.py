@@ -291,7 +291,12 @@ class KeystrokeDetector:
         return events
     
     def analyze_video_content(self, video_data: Dict) -> Dict:
-        """Analyze video content for keystrokes"""
+        """Analyze video content for keystrokes
+        
+        video_data['comments'] may be any iterable, including a lazy stream
+        such as YouTubeMonitor.iter_video_comments; comments are scanned one
+        at a time rather than joined into a single string.
+        """
         all_text = ""
         
         # Combine all text sources
@@ -304,20 +309,15 @@ class KeystrokeDetector:
         if 'summary' in video_data:
             all_text += video_data['summary'] + " "
         
+        # Extract keystrokes, removing duplicates as we go (keep highest confidence)
+        unique_keystrokes = {}
+        self._merge_keystrokes(unique_keystrokes, self.extract_keystrokes_from_text(all_text))
+        
         # Add comments
         if 'comments' in video_data:
             for comment in video_data['comments']:
-                all_text += comment.get('text', '') + " "
-        
-        # Extract keystrokes
-        keystrokes = self.extract_keystrokes_from_text(all_text)
-        
-        # Remove duplicates and sort by confidence
-        unique_keystrokes = {}
-        for event in keystrokes:
-            key = f"{event.command}_{event.context[:50]}"
-            if key not in unique_keystrokes or event.confidence > unique_keystrokes[key].confidence:
-                unique_keystrokes[key] = event
+                self._merge_keystrokes(unique_keystrokes,
+                                       self.extract_keystrokes_from_text(comment.get('text', '')))
         
         return {
             'total_keystrokes': len(unique_keystrokes),
@@ -328,6 +328,13 @@ class KeystrokeDetector:
             'navigation_commands': [k for k in unique_keystrokes.values() if any(nav in k.command.lower() for nav in ['cd', 'ls', 'dir', 'find', 'search'])]
         }
     
+    def _merge_keystrokes(self, unique_keystrokes: Dict[str, KeystrokeEvent], events: List[KeystrokeEvent]):
+        """Fold events into unique_keystrokes, keyed by command and context"""
+        for event in events:
+            key = f"{event.command}_{event.context[:50]}"
+            if key not in unique_keystrokes or event.confidence > unique_keystrokes[key].confidence:
+                unique_keystrokes[key] = event
+    
     def get_keystroke_statistics(self, analysis_result: Dict) -> Dict:
         """Get statistics about keystrokes"""
         events = analysis_result['keystroke_events']
@@ -14,17 +14,31 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from youtube_monitor import YouTubeMonitor
 from video_summarizer import VideoSummarizer
+from concurrent_fetcher import ConcurrentFetcher
+from channel_scheduler import ChannelScheduler, make_sink
 
 def main():
     parser = argparse.ArgumentParser(description='YouTube Activity Monitor & Summarizer')
-    parser.add_argument('--mode', choices=['cli', 'web'], default='web',
-                       help='Run mode: CLI or Web interface')
+    parser.add_argument('--mode', choices=['cli', 'web', 'daemon'], default='web',
+                       help='Run mode: CLI, Web interface or channel-polling daemon')
     parser.add_argument('--channel-id', help='YouTube channel ID to monitor')
+    parser.add_argument('--channels-file',
+                       help='File with one channel ID per line to watch in daemon mode')
+    parser.add_argument('--sink', default='print',
+                       help='Where daemon mode sends new-video events: print, jsonl:<path> or webhook:<url>')
+    parser.add_argument('--min-interval', type=float, default=5,
+                       help='Shortest polling interval in minutes for daemon mode')
+    parser.add_argument('--max-interval', type=float, default=24 * 60,
+                       help='Longest polling interval in minutes for daemon mode')
     parser.add_argument('--api-key', help='YouTube API key')
     parser.add_argument('--max-videos', type=int, default=10, 
                        help='Maximum number of videos to process')
     parser.add_argument('--use-transcription', action='store_true',
                        help='Use audio transcription for summarization')
+    parser.add_argument('--max-workers', type=int, default=8,
+                       help='Maximum number of concurrent YouTube API requests')
+    parser.add_argument('--requests-per-second', type=float,
+                       help='Cap on YouTube API requests per second (default: YOUTUBE_REQUESTS_PER_SECOND, 0 = no cap)')
     
     args = parser.parse_args()
     
@@ -39,6 +53,8 @@ def main():
     
     if args.mode == 'cli':
         run_cli_mode(api_key, args)
+    elif args.mode == 'daemon':
+        run_daemon_mode(api_key, args)
     else:
         run_web_mode()
 
@@ -64,7 +80,8 @@ def run_cli_mode(api_key, args):
         
         # Get videos
         print("📥 Fetching videos...")
-        videos = monitor.get_channel_videos(args.channel_id, args.max_videos)
+        videos = monitor.get_channel_videos(args.channel_id, args.max_videos,
+                                            use_uploads_playlist=True)
         
         if not videos:
             print("❌ No videos found or error occurred")
@@ -75,14 +92,9 @@ def run_cli_mode(api_key, args):
         
         # Get detailed information
         print("📋 Getting video details...")
-        detailed_videos = []
-        for i, video in enumerate(videos, 1):
-            print(f"Processing video {i}/{len(videos)}: {video['title'][:50]}...")
-            details = monitor.get_video_details(video['video_id'])
-            if details:
-                comments = monitor.get_video_comments(details['video_id'], 20)
-                details['comments'] = comments
-                detailed_videos.append(details)
+        fetcher = ConcurrentFetcher(api_key, max_workers=args.max_workers,
+                                    requests_per_second=args.requests_per_second)
+        detailed_videos = fetcher.fetch_videos([v['video_id'] for v in videos], max_comments=20)
         
         print(f"✅ Got details for {len(detailed_videos)} videos")
         print()
@@ -121,6 +133,45 @@ def run_cli_mode(api_key, args):
         print(f"❌ Error: {e}")
         sys.exit(1)
 
+def run_daemon_mode(api_key, args):
+    """Run the multi-channel polling scheduler until interrupted"""
+    channel_ids = []
+    if args.channel_id:
+        channel_ids.append(args.channel_id)
+    if args.channels_file:
+        with open(args.channels_file, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    channel_ids.append(line)
+    
+    if not channel_ids:
+        print("Error: Daemon mode needs --channel-id or --channels-file")
+        sys.exit(1)
+    
+    try:
+        sink = make_sink(args.sink)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    monitor = YouTubeMonitor(api_key)
+    if args.requests_per_second is not None:
+        monitor.quota.set_rate_limit(args.requests_per_second)
+    scheduler = ChannelScheduler(
+        monitor, channel_ids, sink,
+        min_interval_minutes=args.min_interval,
+        max_interval_minutes=args.max_interval
+    )
+    
+    print(f"🛰️  Watching {len(set(channel_ids))} channels (sink: {args.sink})")
+    print(f"📊 Quota remaining today: {monitor.remaining_quota():,} units")
+    
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping daemon")
+
 def run_web_mode():
     """Run in web mode using Streamlit"""
     print("🌐 Starting web interface...")
@@ -0,0 +1,437 @@
+"""
+Offline stand-ins for the YouTube Data API, for benchmarks and load tests.
+
+RecordingHttp / ReplayHttp plug into YouTubeMonitor(http=...) to capture
+real API traffic to a cassette file and play it back without a network.
+StandInServer is a local HTTP server speaking the same wire format, backed
+by a recorded cassette and/or deterministic synthetic data, with
+configurable latency, error injection and daily quota enforcement; point a
+monitor at it with YouTubeMonitor(api_key, api_endpoint=server.url).
+
+Monitors built with http= or api_endpoint= default to in-memory response
+cache, quota and state stores, so offline traffic is never cached for, or
+charged to, real API runs. Pass stores explicitly to share them.
+"""
+
+import json
+import time
+import random
+import hashlib
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+import httplib2
+
+from quota_manager import QUOTA_COSTS, DEFAULT_COST, DAILY_QUOTA
+
+# Query parameters that do not change the response and are left out of
+# cassette keys (the API key must never be written to disk)
+_IGNORED_PARAMS = {'key', 'alt', 'prettyPrint'}
+
+
+def request_key(method: str, uri: str) -> str:
+    """Normalised cassette key: method, API path and sorted query"""
+    parts = urlsplit(uri)
+    path = parts.path.split('/youtube/v3/', 1)[-1]
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if k not in _IGNORED_PARAMS)
+    return f"{method} {path}?" + '&'.join(f"{k}={v}" for k, v in query)
+
+
+def parse_field_mask(mask: str) -> Dict:
+    """Parse a partial-response mask such as 'etag,items(id,snippet/title)'.
+
+    Returns a tree of {field: subtree}, where a subtree of None keeps the
+    whole value.
+    """
+    tree, _ = _parse_selection(mask.replace(' ', ''), 0)
+    return tree
+
+
+def apply_field_mask(value, tree: Optional[Dict]):
+    """Keep only the parts of a response selected by a parsed mask"""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [apply_field_mask(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: apply_field_mask(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+def _parse_selection(mask: str, i: int):
+    tree = {}
+    while i < len(mask) and mask[i] != ')':
+        i = _parse_path(mask, i, tree)
+        if i < len(mask) and mask[i] == ',':
+            i += 1
+    return tree, i
+
+
+def _parse_path(mask: str, i: int, tree: Dict) -> int:
+    j = i
+    while j < len(mask) and mask[j] not in ',/()':
+        j += 1
+    name = mask[i:j]
+
+    if j < len(mask) and mask[j] in '/(':
+        if name in tree and tree[name] is None:
+            sub = None  # already selected whole
+        else:
+            sub = tree.setdefault(name, {})
+        scratch = {} if sub is None else sub
+        if mask[j] == '/':
+            j = _parse_path(mask, j + 1, scratch)
+        else:
+            selection, j = _parse_selection(mask, j + 1)
+            j += 1  # closing ')'
+            for key, value in selection.items():
+                scratch[key] = value
+        return j
+
+    tree[name] = None
+    return j
+
+
+def load_cassette(path: str) -> Dict[str, Dict]:
+    with open(path, 'r') as f:
+        return {entry['key']: entry for entry in json.load(f)}
+
+
+class RecordingHttp:
+    """httplib2.Http wrapper that records every exchange to a cassette file"""
+
+    def __init__(self, path: str, http: Optional[httplib2.Http] = None):
+        self.path = path
+        self.http = http or httplib2.Http()
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        response, content = self.http.request(uri, method, body=body, headers=headers, **kwargs)
+        with self._lock:
+            self.entries.append({
+                'key': request_key(method, uri),
+                'status': response.status,
+                'headers': {k: v for k, v in response.items() if k in ('content-type', 'etag')},
+                'content': content.decode('utf-8') if isinstance(content, bytes) else content
+            })
+        return response, content
+
+    def save(self):
+        with self._lock, open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+
+
+class ReplayHttp:
+    """httplib2.Http stand-in that answers from a recorded cassette.
+
+    Unknown requests get a 404 API error, or raise KeyError when strict.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0, strict: bool = False):
+        self.entries = load_cassette(path)
+        self.latency = latency
+        self.strict = strict
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        entry = self.entries.get(request_key(method, uri))
+        if entry is None:
+            if self.strict:
+                raise KeyError(f"No recorded response for {request_key(method, uri)}")
+            return _httplib2_response(404, _error_body(404, 'notFound', 'Not recorded'))
+
+        etag = entry['headers'].get('etag')
+        if etag and _header(headers, 'If-None-Match') == etag:
+            return _httplib2_response(304, '', {'etag': etag})
+        return _httplib2_response(entry['status'], entry['content'], entry['headers'])
+
+
+@dataclass
+class FaultConfig:
+    """Simulated network conditions for StandInServer"""
+    latency: float = 0.0           # seconds added to every response
+    jitter: float = 0.0            # extra uniformly random latency, seconds
+    error_rate: float = 0.0        # fraction of requests answered with a 503
+    daily_quota: int = DAILY_QUOTA # units before requests get quotaExceeded
+    seed: int = 0
+
+
+class SyntheticYouTube:
+    """Deterministic fake channels, videos and comments"""
+
+    def __init__(self, uploads_per_channel: int = 500, comments_per_video: int = 250,
+                 replies_per_comment: int = 3, trending_size: int = 200, search_size: int = 500):
+        self.uploads_per_channel = uploads_per_channel
+        self.comments_per_video = comments_per_video
+        self.replies_per_comment = replies_per_comment
+        self.trending_size = trending_size
+        self.search_size = search_size
+
+    @staticmethod
+    def _number(*parts) -> int:
+        return int(hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()[:8], 16)
+
+    @staticmethod
+    def _timestamp(offset_hours: int) -> str:
+        # Fixed epoch so repeated runs produce byte-identical responses
+        base = 1735689600  # 2025-01-01T00:00:00Z
+        return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(base - offset_hours * 3600))
+
+    def video(self, video_id: str) -> Dict:
+        n = self._number(video_id)
+        return {
+            'kind': 'youtube#video',
+            'id': video_id,
+            'snippet': {
+                'publishedAt': self._timestamp(n % 5000),
+                'channelId': f"UC{n % 1000:022d}",
+                'title': f"Synthetic video {video_id}",
+                'description': f"Description of {video_id}. " * (1 + n % 20),
+                'thumbnails': {'high': {'url': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                'tags': [f"tag{n % 7}", f"tag{n % 11}"]
+            },
+            'contentDetails': {'duration': f"PT{1 + n % 59}M{n % 60}S"},
+            'statistics': {
+                'viewCount': str(n % 10_000_000),
+                'likeCount': str(n % 100_000),
+                'commentCount': str(n % 5_000)
+            }
+        }
+
+    def playlist_item(self, playlist_id: str, position: int) -> Dict:
+        video_id = f"{playlist_id[-6:]}{position:05d}"
+        published = self._timestamp(position * 24)
+        return {
+            'kind': 'youtube#playlistItem',
+            'snippet': {
+                'publishedAt': published,
+                'title': f"Upload {position} of {playlist_id}",
+                'description': f"Upload number {position}",
+                'thumbnails': {'high': {'url': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                'position': position
+            },
+            'contentDetails': {'videoId': video_id, 'videoPublishedAt': published}
+        }
+
+    def comment(self, comment_id: str, parent_id: Optional[str] = None) -> Dict:
+        n = self._number(comment_id)
+        snippet = {
+            'authorDisplayName': f"user{n % 10000}",
+            'textDisplay': f"Comment {comment_id}: try ctrl c then git status",
+            'likeCount': n % 500,
+            'publishedAt': self._timestamp(n % 2000)
+        }
+        if parent_id:
+            snippet['parentId'] = parent_id
+        return {'kind': 'youtube#comment', 'id': comment_id, 'snippet': snippet}
+
+    def comment_thread(self, video_id: str, index: int) -> Dict:
+        comment_id = f"{video_id}.c{index}"
+        return {
+            'kind': 'youtube#commentThread',
+            'id': comment_id,
+            'snippet': {
+                'videoId': video_id,
+                'topLevelComment': self.comment(comment_id),
+                'totalReplyCount': self.replies_per_comment
+            },
+            'replies': {'comments': [self.comment(f"{comment_id}.r{i}", comment_id)
+                                     for i in range(min(self.replies_per_comment, 5))]}
+        }
+
+    def respond(self, resource: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """Build the response for GET /youtube/v3/<resource>"""
+        page_size = int(params.get('maxResults', 5))
+        offset = int(params.get('pageToken') or 0)
+
+        if resource == 'videos':
+            if params.get('chart') == 'mostPopular':
+                ids = [f"trend{params.get('regionCode', 'US')}{i:04d}" for i in range(self.trending_size)]
+                return 200, self._page('youtube#videoListResponse',
+                                       [self.video(v) for v in ids[offset:offset + page_size]],
+                                       offset, page_size, len(ids))
+            ids = [v for v in params.get('id', '').split(',') if v]
+            return 200, {'kind': 'youtube#videoListResponse', 'items': [self.video(v) for v in ids]}
+
+        if resource == 'channels':
+            items = [{'kind': 'youtube#channel', 'id': c,
+                      'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + c[2:]}}}
+                     for c in params.get('id', '').split(',') if c]
+            return 200, {'kind': 'youtube#channelListResponse', 'items': items}
+
+        if resource == 'playlistItems':
+            total = self.uploads_per_channel
+            items = [self.playlist_item(params['playlistId'], p)
+                     for p in range(offset, min(offset + page_size, total))]
+            return 200, self._page('youtube#playlistItemListResponse', items, offset, page_size, total)
+
+        if resource == 'search':
+            query = params.get('q', '')
+            total = self.search_size
+            items = []
+            for i in range(offset, min(offset + page_size, total)):
+                video = self.video(f"s{self._number(query, i) % 10**9:09d}")
+                items.append({'kind': 'youtube#searchResult',
+                              'id': {'kind': 'youtube#video', 'videoId': video['id']},
+                              'snippet': video['snippet']})
+            return 200, self._page('youtube#searchListResponse', items, offset, page_size, total)
+
+        if resource == 'commentThreads':
+            video_id = params.get('videoId', '')
+            total = self.comments_per_video
+            items = [self.comment_thread(video_id, i) for i in range(offset, min(offset + page_size, total))]
+            return 200, self._page('youtube#commentThreadListResponse', items, offset, page_size, total)
+
+        if resource == 'comments':
+            parent_id = params.get('parentId', '')
+            total = self.replies_per_comment
+            items = [self.comment(f"{parent_id}.r{i}", parent_id)
+                     for i in range(offset, min(offset + page_size, total))]
+            return 200, self._page('youtube#commentListResponse', items, offset, page_size, total)
+
+        return 404, _error_body(404, 'notFound', f"Unknown resource {resource}")
+
+    @staticmethod
+    def _page(kind: str, items: List[Dict], offset: int, page_size: int, total: int) -> Dict:
+        body = {'kind': kind, 'items': items,
+                'pageInfo': {'totalResults': total, 'resultsPerPage': page_size}}
+        if offset + page_size < total:
+            body['nextPageToken'] = str(offset + page_size)
+        return body
+
+
+class StandInServer:
+    """Local YouTube Data API v3 stand-in serving recorded or synthetic responses.
+
+    Use as a context manager, or call start() / stop().
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 faults: Optional[FaultConfig] = None,
+                 data: Optional[SyntheticYouTube] = None,
+                 cassette_path: Optional[str] = None):
+        self.faults = faults or FaultConfig()
+        self.data = data or SyntheticYouTube()
+        self.recorded = load_cassette(cassette_path) if cassette_path else {}
+        self.quota_used = 0
+        self.request_count = 0
+        self.bytes_sent = 0
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_quota(self):
+        with self._lock:
+            self.quota_used = 0
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        parts = urlsplit(handler.path)
+        resource = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        params = dict(parse_qsl(parts.query))
+
+        with self._lock:
+            self.request_count += 1
+            delay = self.faults.latency + self._random.uniform(0, self.faults.jitter)
+            fail = self._random.random() < self.faults.error_rate
+            cost = QUOTA_COSTS.get(f"{resource}.list", DEFAULT_COST)
+            over_quota = self.quota_used + cost > self.faults.daily_quota
+            if not over_quota:
+                self.quota_used += cost
+
+        if delay:
+            time.sleep(delay)
+
+        if over_quota:
+            status, body = 403, _error_body(403, 'quotaExceeded',
+                                            'The request cannot be completed because you have exceeded your quota.')
+        elif fail:
+            status, body = 503, _error_body(503, 'backendError', 'Simulated backend error')
+        else:
+            entry = self.recorded.get(request_key('GET', handler.path))
+            if entry is not None:
+                status, body = entry['status'], json.loads(entry['content'] or '{}')
+            else:
+                status, body = self.data.respond(resource, params)
+            if status == 200 and params.get('fields'):
+                body = apply_field_mask(body, parse_field_mask(params['fields']))
+
+        content = json.dumps(body)
+        etag = '"' + hashlib.sha1(content.encode('utf-8')).hexdigest() + '"'
+        if status == 200:
+            body['etag'] = etag
+            content = json.dumps(body)
+
+        if status == 200 and handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+
+        payload = content.encode('utf-8')
+        with self._lock:
+            self.bytes_sent += len(payload)
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json; charset=UTF-8')
+        handler.send_header('Content-Length', str(len(payload)))
+        if status == 200:
+            handler.send_header('ETag', etag)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+def _header(headers: Optional[Dict], name: str) -> Optional[str]:
+    for key, value in (headers or {}).items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+def _error_body(code: int, reason: str, message: str) -> Dict:
+    return {'error': {'code': code, 'message': message,
+                      'errors': [{'message': message, 'domain': 'youtube', 'reason': reason}]}}
+
+
+def _httplib2_response(status: int, content, headers: Optional[Dict] = None):
+    info = {'status': str(status), 'content-type': 'application/json; charset=UTF-8'}
+    info.update(headers or {})
+    body = json.dumps(content) if isinstance(content, dict) else content
+    return httplib2.Response(info), body.encode('utf-8')
@@ -8,6 +8,10 @@ from dotenv import load_dotenv
 
 from youtube_monitor import YouTubeMonitor
 from video_summarizer import VideoSummarizer
+from concurrent_fetcher import ConcurrentFetcher
+from quota_manager import QuotaExceededError, DEFAULT_REQUESTS_PER_SECOND
+from snapshot_store import SnapshotStore
+from engagement_analytics import EngagementAnalytics
 
 # Load environment variables
 load_dotenv()
@@ -59,6 +63,7 @@ def main():
             os.environ['YOUTUBE_API_KEY'] = api_key
         
         st.subheader("Monitoring Options")
+        record_snapshots = False
         monitor_type = st.selectbox("Monitor Type", 
                                    ["Channel", "Trending", "Search"])
         
@@ -71,15 +76,24 @@ def main():
             region_code = st.selectbox("Region", 
                                       ["US", "GB", "CA", "AU", "IN", "DE", "FR", "JP"])
             max_videos = st.slider("Max Videos", 10, 100, 50)
+            record_snapshots = st.checkbox("Record Statistics Snapshots", True,
+                                           help="Append view/like/comment counts to the snapshot history")
         
         else:  # Search
             search_query = st.text_input("Search Query")
             max_videos = st.slider("Max Videos", 10, 100, 50)
+            search_window = st.selectbox("Published Within", ["Any time", "24 hours", "7 days", "30 days"])
+            only_new_results = st.checkbox("Only New Since Last Run",
+                                           help="Treat this query as a saved search and show only unseen videos")
         
         st.subheader("Summarization Options")
         use_transcription = st.checkbox("Use Audio Transcription (Slower)", 
                                       help="Download and transcribe video audio")
         summary_length = st.slider("Summary Length", 50, 300, 150)
+        max_workers = st.slider("Parallel Requests", 1, 16, 8,
+                               help="Concurrent YouTube API requests when fetching details")
+        requests_per_second = st.number_input("Requests per Second", min_value=0.0, value=DEFAULT_REQUESTS_PER_SECOND,
+                                              help="Cap on YouTube API request rate (0 = no cap)")
         
         auto_refresh = st.checkbox("Auto Refresh (minutes)")
         if auto_refresh:
@@ -100,12 +114,15 @@ def main():
     
     # Initialize monitor and summarizer
     try:
-        monitor = YouTubeMonitor(api_key)
+        monitor = YouTubeMonitor(api_key,
+                                 snapshot_store=SnapshotStore() if record_snapshots else None)
         summarizer = VideoSummarizer()
     except Exception as e:
         st.error(f"Error initializing services: {e}")
         return
     
+    st.sidebar.caption(f"YouTube quota remaining today: {monitor.remaining_quota():,} units")
+    
     # Tabs for different views
     tab1, tab2, tab3 = st.tabs(["📊 Monitor", "📝 Summaries", "📈 Analytics"])
     
@@ -117,15 +134,24 @@ def main():
         with col1:
             if st.button("Start Monitoring", type="primary"):
                 with st.spinner("Fetching YouTube data..."):
-                    if monitor_type == "Channel" and channel_id:
-                        videos = monitor.get_channel_videos(channel_id, max_videos)
-                    elif monitor_type == "Trending":
-                        videos = monitor.search_trending_videos(region_code, max_videos)
-                    elif monitor_type == "Search" and search_query:
-                        # This would require implementing search functionality
-                        st.info("Search functionality coming soon!")
-                        videos = []
-                    else:
+                    try:
+                        if monitor_type == "Channel" and channel_id:
+                            videos = monitor.get_channel_videos(channel_id, max_videos,
+                                                                use_uploads_playlist=True)
+                        elif monitor_type == "Trending":
+                            videos = monitor.search_trending_videos(region_code, max_videos)
+                        elif monitor_type == "Search" and search_query:
+                            window_hours = {"24 hours": 24, "7 days": 24 * 7, "30 days": 24 * 30}.get(search_window)
+                            if only_new_results:
+                                videos = monitor.search_new_videos(search_query, max_videos,
+                                                                   window_hours=window_hours)
+                            else:
+                                videos = monitor.search_videos(search_query, max_videos,
+                                                               window_hours=window_hours)
+                        else:
+                            videos = []
+                    except QuotaExceededError as e:
+                        st.error(str(e))
                         videos = []
                     
                     if videos:
@@ -176,14 +202,14 @@ def main():
                     videos = st.session_state.videos
                     
                     # Get detailed video information
-                    detailed_videos = []
-                    for video in videos[:10]:  # Limit to 10 for demo
-                        details = monitor.get_video_details(video['video_id'])
-                        if details:
-                            # Get comments
-                            comments = monitor.get_video_comments(details['video_id'], 20)
-                            details['comments'] = comments
-                            detailed_videos.append(details)
+                    videos = videos[:10]  # Limit to 10 for demo
+                    fetcher = ConcurrentFetcher(api_key, max_workers=max_workers,
+                                                requests_per_second=requests_per_second)
+                    try:
+                        detailed_videos = fetcher.fetch_videos([v['video_id'] for v in videos], max_comments=20)
+                    except QuotaExceededError as e:
+                        st.error(str(e))
+                        detailed_videos = []
                     
                     # Generate summaries
                     summaries = summarizer.batch_summarize_videos(
@@ -271,6 +297,38 @@ def main():
         
         else:
             st.info("Generate summaries first to see analytics.")
+        
+        # Growth analytics over the recorded trending snapshots
+        if monitor.snapshot_store is not None:
+            st.subheader("Trending Velocity (last 7 days)")
+            history = monitor.snapshot_store.query(
+                start=datetime.now() - timedelta(days=7),
+                regions=[region_code]
+            )
+            
+            if history.empty:
+                st.info("No snapshots recorded yet. Fetch trending videos to start the history.")
+            else:
+                analytics = EngagementAnalytics()
+                top_videos = analytics.top_k(analytics.compute(history), k=20)
+                titles = {v['video_id']: v['title'] for v in st.session_state.get('videos', [])}
+                top_videos['title'] = top_videos['video_id'].map(titles).fillna(top_videos['video_id'])
+                
+                fig_velocity = px.bar(
+                    top_videos,
+                    x='views_per_hour',
+                    y='title',
+                    orientation='h',
+                    title="Fastest Growing Videos (views per hour)",
+                    labels={'views_per_hour': 'Views / hour', 'title': 'Video'}
+                )
+                fig_velocity.update_layout(yaxis={'categoryorder':'total ascending'})
+                st.plotly_chart(fig_velocity, use_container_width=True)
+                
+                st.dataframe(
+                    top_videos[['rank', 'title', 'views_per_hour', 'acceleration', 'velocity_zscore', 'engagement']],
+                    use_container_width=True
+                )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,142 @@
+from typing import List, Tuple
+
+import ffmpeg
+import numpy as np
+
+# Whisper models expect 16 kHz mono input
+SAMPLE_RATE = 16000
+
+
+def decode_audio(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any audio or video file to mono float32 samples in [-1, 1].
+
+    ffmpeg writes raw 16-bit PCM to a pipe that is read straight into
+    memory, so nothing is written to disk.
+    """
+    out, _ = (
+        ffmpeg
+        .input(path, threads=0)
+        .output('pipe:', format='s16le', acodec='pcm_s16le', ac=1, ar=sample_rate)
+        .global_args('-nostdin', '-loglevel', 'error')
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def frame_energy(audio: np.ndarray, frame_length: int) -> np.ndarray:
+    """RMS level in dBFS of consecutive, non-overlapping frames"""
+    frames = len(audio) // frame_length
+    if frames == 0:
+        return np.empty(0, dtype=np.float32)
+    blocks = audio[:frames * frame_length].reshape(frames, frame_length)
+    rms = np.sqrt(np.mean(np.square(blocks, dtype=np.float32), axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def split_on_silence(audio: np.ndarray, max_seconds: float, sample_rate: int = SAMPLE_RATE,
+                     frame_seconds: float = 0.02, smooth_seconds: float = 0.3,
+                     tolerance_db: float = 3.0, min_segment_seconds: float = 1.0) -> List[Tuple[int, int]]:
+    """Split audio into (start, end) sample ranges of at most max_seconds.
+
+    Each cut is placed in the second half of the allowed range, at the
+    latest point within tolerance_db of the quietest one, so segments end
+    in pauses rather than mid-word and stay close to max_seconds long.
+    No cut leaves less than min_segment_seconds after it, since Whisper
+    tends to invent text for very short clips.
+    """
+    total = len(audio)
+    max_samples = int(max_seconds * sample_rate)
+    min_samples = int(min_segment_seconds * sample_rate)
+    if total <= max_samples:
+        return [(0, total)]
+
+    frame = max(int(frame_seconds * sample_rate), 1)
+    energy = frame_energy(audio, frame)
+    window = max(int(smooth_seconds / frame_seconds), 1)
+    smoothed = np.convolve(energy, np.ones(window) / window, mode='same')
+
+    ranges = []
+    start = 0
+    while total - start > max_samples:
+        low = (start + max_samples // 2) // frame
+        high = min((start + max_samples) // frame, len(smoothed), (total - min_samples) // frame)
+        if high > low:
+            levels = smoothed[low:high]
+            quiet = np.flatnonzero(levels <= levels.min() + tolerance_db)
+            cut = (low + int(quiet[-1])) * frame
+        else:
+            cut = max(min(start + max_samples, total - min_samples), start + 1)
+        ranges.append((start, cut))
+        start = cut
+    ranges.append((start, total))
+    return ranges
+
+
+def speech_regions(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_seconds: float = 0.03,
+                   margin_db: float = 12.0, loud_db: float = -35.0, floor_db: float = -50.0,
+                   min_speech_seconds: float = 0.3, min_silence_seconds: float = 0.6,
+                   padding_seconds: float = 0.2) -> List[Tuple[int, int]]:
+    """(start, end) sample ranges that likely contain speech.
+
+    A frame counts as active when it is margin_db above the noise floor
+    (the 10th percentile frame level) or louder than loud_db in absolute
+    terms, and in any case above floor_db. The absolute level keeps speech
+    over a steady music bed or room tone active even though it never
+    rises far above that floor. Gaps shorter than min_silence_seconds are
+    bridged, bursts shorter than min_speech_seconds dropped, and each
+    region padded so word onsets and tails are kept. This is an energy
+    detector: it removes silence and quiet stretches, while music is kept
+    and left to Whisper.
+    """
+    frame = max(int(frame_seconds * sample_rate), 1)
+    energy = frame_energy(audio, frame)
+    if len(energy) == 0:
+        return []
+
+    threshold = max(min(np.percentile(energy, 10) + margin_db, loud_db), floor_db)
+    active = energy > threshold
+
+    # Run boundaries of active frames as [start, end) frame indices
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return []
+
+    # Bridge short pauses, then drop short bursts
+    keep = (starts[1:] - ends[:-1]) * frame >= min_silence_seconds * sample_rate
+    starts = np.concatenate(([starts[0]], starts[1:][keep]))
+    ends = np.concatenate((ends[:-1][keep], [ends[-1]]))
+    long_enough = (ends - starts) * frame >= min_speech_seconds * sample_rate
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    padding = int(padding_seconds * sample_rate)
+    regions = []
+    for start, end in zip(starts * frame - padding, ends * frame + padding):
+        start, end = max(int(start), 0), min(int(end), len(audio))
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def timeline_mapper(regions: List[Tuple[int, int]], sample_rate: int = SAMPLE_RATE):
+    """Map times in the concatenation of regions back to the original audio.
+
+    Returns a function taking seconds on the concatenated timeline and
+    returning seconds on the original one. A time exactly on the seam
+    between two regions maps to the end of the earlier region when
+    is_end is set, otherwise to the start of the later one.
+    """
+    lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+    concat_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    original_starts = np.array([start for start, _ in regions], dtype=np.int64)
+
+    def to_original(seconds: float, is_end: bool = False) -> float:
+        position = seconds * sample_rate
+        side = 'left' if is_end else 'right'
+        index = max(int(np.searchsorted(concat_starts, position, side=side)) - 1, 0)
+        return float(original_starts[index] + position - concat_starts[index]) / sample_rate
+
+    return to_original
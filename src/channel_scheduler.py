@@ -0,0 +1,193 @@
+import sys
+import json
+import heapq
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from youtube_monitor import YouTubeMonitor
+from quota_manager import QuotaExceededError
+
+
+class EventSink(ABC):
+    """Destination for new-video events emitted by the scheduler"""
+
+    @abstractmethod
+    def emit(self, event: Dict):
+        """Deliver one new-video event"""
+
+    def close(self):
+        pass
+
+
+class PrintSink(EventSink):
+    """Print one line per new video"""
+
+    def emit(self, event: Dict):
+        video = event['video']
+        print(f"🆕 [{event['channel_id']}] {video.get('title', '')} "
+              f"(https://www.youtube.com/watch?v={video['video_id']})")
+        sys.stdout.flush()
+
+
+class JsonlSink(EventSink):
+    """Append events as JSON lines to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a')
+
+    def emit(self, event: Dict):
+        self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class WebhookSink(EventSink):
+    """POST each event as JSON to a URL"""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def emit(self, event: Dict):
+        try:
+            self.session.post(self.url, json=event, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Error posting event to {self.url}: {e}")
+
+    def close(self):
+        self.session.close()
+
+
+class CallbackSink(EventSink):
+    """Hand events to an arbitrary callable"""
+
+    def __init__(self, callback: Callable[[Dict], None]):
+        self.callback = callback
+
+    def emit(self, event: Dict):
+        self.callback(event)
+
+
+def make_sink(spec: str) -> EventSink:
+    """Build a sink from a CLI spec: 'print', 'jsonl:<path>' or 'webhook:<url>'"""
+    kind, _, target = spec.partition(':')
+    if kind == 'print':
+        return PrintSink()
+    if kind == 'jsonl' and target:
+        return JsonlSink(target)
+    if kind == 'webhook' and target:
+        return WebhookSink(target)
+    raise ValueError(f"Unknown sink '{spec}' (expected print, jsonl:<path> or webhook:<url>)")
+
+
+class ChannelScheduler:
+    """Polls many channels, each on an interval adapted to its upload rate.
+
+    Channels sit in a min-heap keyed by their next due time. After each
+    check the interval is recomputed from how many uploads the channel
+    had over the last activity_window_days: a channel is polled about
+    checks_per_upload times per average gap between uploads, clamped to
+    [min_interval_minutes, max_interval_minutes]. Quota spend therefore
+    follows actual activity.
+    """
+
+    def __init__(self, monitor: YouTubeMonitor, channel_ids: List[str], sink: EventSink,
+                 min_interval_minutes: float = 5, max_interval_minutes: float = 24 * 60,
+                 checks_per_upload: float = 12, activity_window_days: int = 30,
+                 emit_initial: bool = False):
+        self.monitor = monitor
+        self.sink = sink
+        self.min_interval_minutes = min_interval_minutes
+        self.max_interval_minutes = max_interval_minutes
+        self.checks_per_upload = checks_per_upload
+        self.activity_window_days = activity_window_days
+        self.emit_initial = emit_initial
+        self._stop = threading.Event()
+        self._queue = []
+
+        now = datetime.now()
+        for channel_id in dict.fromkeys(channel_ids):
+            state = monitor.state_store.get_channel(channel_id)
+            next_check = datetime.fromisoformat(state['next_check']) if state.get('next_check') else now
+            heapq.heappush(self._queue, (next_check, channel_id))
+
+    def compute_interval(self, channel_id: str) -> float:
+        """Polling interval in minutes from the channel's recent upload count"""
+        since = (datetime.now(timezone.utc) - timedelta(days=self.activity_window_days))
+        uploads = self.monitor.state_store.count_uploads_since(
+            channel_id, since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        )
+        if uploads == 0:
+            return self.max_interval_minutes
+
+        average_gap_minutes = self.activity_window_days * 24 * 60 / uploads
+        interval = average_gap_minutes / self.checks_per_upload
+        return max(self.min_interval_minutes, min(self.max_interval_minutes, interval))
+
+    def check_channel(self, channel_id: str) -> Dict:
+        """Check one channel now, emit its new videos and reschedule it"""
+        first_check = not self.monitor.state_store.has_channel(channel_id)
+        result = self.monitor.monitor_channel_activity(channel_id, self.compute_interval(channel_id))
+
+        # Recompute now that the latest uploads are stored
+        interval = self.compute_interval(channel_id)
+        next_check = datetime.now() + timedelta(minutes=interval)
+        self.monitor.state_store.set_schedule(channel_id, interval, next_check.isoformat())
+        heapq.heappush(self._queue, (next_check, channel_id))
+
+        if not first_check or self.emit_initial:
+            for video in result['new_videos']:
+                self.sink.emit({
+                    'type': 'new_video',
+                    'channel_id': channel_id,
+                    'video': video,
+                    'detected_at': result['last_check']
+                })
+
+        result['interval_minutes'] = interval
+        return result
+
+    def run_once(self) -> Optional[Dict]:
+        """Wait for the next due channel and check it; None if stopped"""
+        if not self._queue:
+            self._stop.wait()
+            return None
+
+        due, channel_id = self._queue[0]
+        delay = (due - datetime.now()).total_seconds()
+        if delay > 0 and self._stop.wait(delay):
+            return None
+
+        heapq.heappop(self._queue)
+        try:
+            return self.check_channel(channel_id)
+        except QuotaExceededError as e:
+            # Nothing else can run either; push everything past the pause
+            print(f"⏸️  {e}. Pausing checks for {self.max_interval_minutes:.0f} minutes")
+            resume = datetime.now() + timedelta(minutes=self.max_interval_minutes)
+            self._queue = [(max(d, resume), c) for d, c in self._queue]
+            self._queue.append((resume, channel_id))
+            heapq.heapify(self._queue)
+        except Exception as e:
+            print(f"Error checking channel {channel_id}: {e}")
+            heapq.heappush(self._queue, (datetime.now() + timedelta(minutes=self.min_interval_minutes), channel_id))
+        return None
+
+    def run(self):
+        """Run until stop() is called"""
+        try:
+            while not self._stop.is_set():
+                self.run_once()
+        finally:
+            self.sink.close()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+from youtube_monitor import YouTubeMonitor, MAX_IDS_PER_REQUEST
+
+
+class ConcurrentFetcher:
+    """Fetch details and comments for many videos in parallel.
+
+    googleapiclient service objects share one httplib2.Http, which is not
+    thread-safe, so every worker thread uses its own YouTubeMonitor (and,
+    through youtube_client.get_client, its own pooled API client).
+    """
+
+    def __init__(self, api_key: str, max_workers: int = 8,
+                 monitor_factory: Optional[Callable[[], YouTubeMonitor]] = None,
+                 requests_per_second: Optional[float] = None):
+        self.api_key = api_key
+        self.max_workers = max(1, max_workers)
+        # Default monitors share the process-wide response cache and quota
+        # manager (and so one rate limiter)
+        self.monitor_factory = monitor_factory or (lambda: YouTubeMonitor(api_key))
+        # None keeps the quota manager's own setting; 0 removes the cap
+        self.requests_per_second = requests_per_second
+        self._local = threading.local()
+
+    def _monitor(self) -> YouTubeMonitor:
+        """Return the calling worker's private monitor"""
+        monitor = getattr(self._local, 'monitor', None)
+        if monitor is None:
+            monitor = self.monitor_factory()
+            if self.requests_per_second is not None:
+                monitor.quota.set_rate_limit(self.requests_per_second)
+            self._local.monitor = monitor
+        return monitor
+
+    def _fetch_details(self, video_ids: List[str]) -> Dict[str, Dict]:
+        return self._monitor().get_videos_details(video_ids)
+
+    def _fetch_comments(self, video_id: str, max_comments: int) -> List[Dict]:
+        return self._monitor().get_video_comments(video_id, max_comments)
+
+    def fetch_videos(self, video_ids: List[str], max_comments: int = 20,
+                     include_comments: bool = True) -> List[Dict]:
+        """Fetch details (and comments) for each video, in input order.
+
+        Details are requested in batches of 50 IDs; comment requests for a
+        batch are queued as soon as its details arrive. Videos whose details
+        could not be fetched are left out, as in the sequential loop.
+        """
+        unique_ids = list(dict.fromkeys(v for v in video_ids if v))
+        details_by_id = {}
+        comments_by_id = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            detail_futures = [
+                executor.submit(self._fetch_details, unique_ids[i:i + MAX_IDS_PER_REQUEST])
+                for i in range(0, len(unique_ids), MAX_IDS_PER_REQUEST)
+            ]
+            comment_futures = {}
+
+            for future in as_completed(detail_futures):
+                batch_details = future.result()
+                details_by_id.update(batch_details)
+                if include_comments:
+                    for video_id in batch_details:
+                        comment_futures[executor.submit(self._fetch_comments, video_id, max_comments)] = video_id
+
+            for future in as_completed(comment_futures):
+                comments_by_id[comment_futures[future]] = future.result()
+
+        results = []
+        for video_id in video_ids:
+            details = details_by_id.get(video_id)
+            if not details:
+                continue
+
+            video = dict(details)
+            if include_comments:
+                video['comments'] = comments_by_id.get(video_id, [])
+            results.append(video)
+
+        return results
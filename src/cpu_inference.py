@@ -0,0 +1,172 @@
+import os
+import time
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import torch
+from torch.ao.nn.quantized import dynamic as nnqd
+from torch.ao.quantization import get_default_dynamic_quant_module_mappings
+
+# Thread counts from the environment; unset leaves torch's defaults
+DEFAULT_TORCH_THREADS = int(os.getenv('TORCH_NUM_THREADS', 0)) or None
+DEFAULT_INTEROP_THREADS = int(os.getenv('TORCH_INTEROP_THREADS', 0)) or None
+# Apply int8 dynamic quantization to CPU models
+DEFAULT_QUANTIZE = os.getenv('SUMMARIZER_QUANTIZE', '').lower() in ('1', 'true', 'yes')
+# 'torch' or 'onnx' (needs optimum[onnxruntime])
+DEFAULT_BACKEND = os.getenv('SUMMARIZER_BACKEND', 'torch')
+
+_threads_lock = threading.Lock()
+
+
+def configure_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None):
+    """Set torch's intra-op and inter-op thread pools for this process.
+
+    torch only accepts an inter-op setting before its first parallel
+    operation; a later attempt is reported and ignored.
+    """
+    with _threads_lock:
+        if intra_op and torch.get_num_threads() != intra_op:
+            torch.set_num_threads(intra_op)
+        if inter_op and torch.get_num_interop_threads() != inter_op:
+            try:
+                torch.set_num_interop_threads(inter_op)
+            except RuntimeError as e:
+                print(f"Could not set inter-op threads to {inter_op}: {e}")
+
+
+class _DynamicLinearFromSubclass(nnqd.Linear):
+    """Dynamic int8 Linear converted from a subclass of nn.Linear.
+
+    nnqd.Linear.from_float accepts only exact nn.Linear modules, so the
+    subclass's parameters are first moved onto a plain nn.Linear.
+    """
+
+    @classmethod
+    def from_float(cls, mod, *args, **kwargs):
+        linear = torch.nn.Linear(mod.in_features, mod.out_features, bias=mod.bias is not None)
+        linear.weight = mod.weight
+        linear.bias = mod.bias
+        linear.qconfig = mod.qconfig
+        return nnqd.Linear.from_float(linear, *args, **kwargs)
+
+
+def quantize_linear(model: torch.nn.Module, linear_types=(torch.nn.Linear,)) -> torch.nn.Module:
+    """int8 dynamic quantization of a model's Linear layers (CPU only)
+
+    quantize_dynamic matches module types exactly, so models with their
+    own nn.Linear subclasses (Whisper) must list them in linear_types.
+    """
+    mapping = dict(get_default_dynamic_quant_module_mappings())
+    for linear_type in linear_types:
+        mapping.setdefault(linear_type, _DynamicLinearFromSubclass)
+    quantized = torch.quantization.quantize_dynamic(model, qconfig_spec=set(linear_types), dtype=torch.qint8,
+                                                    mapping=mapping)
+    if not any(isinstance(module, nnqd.Linear) for module in quantized.modules()):
+        print(f"Warning: no Linear layers of {type(model).__name__} were quantized")
+    return quantized
+
+
+def quantize_whisper(model: torch.nn.Module) -> torch.nn.Module:
+    """quantize_linear for Whisper, whose layers use whisper.model.Linear"""
+    import whisper.model
+
+    return quantize_linear(model, (torch.nn.Linear, whisper.model.Linear))
+
+
+def onnx_available() -> bool:
+    """Whether optimum[onnxruntime], needed by the ONNX backend, is installed"""
+    try:
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def load_onnx_summarizer(model_name: str):
+    """Summarization pipeline running on ONNX Runtime, exported from the HF model.
+
+    Returns None when optimum[onnxruntime] is not installed.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        from transformers import AutoTokenizer, pipeline
+    except ImportError:
+        print("ONNX backend needs optimum. Install with: pip install optimum[onnxruntime]")
+        return None
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def _tokens(text: str) -> List[str]:
+    return ''.join(c.lower() if c.isalnum() else ' ' for c in text).split()
+
+
+def _f1(overlap: int, candidate: int, reference: int) -> float:
+    if overlap == 0:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate: str, reference: str, n: int = 1) -> float:
+    """ROUGE-N F1 over lowercased word n-grams"""
+    def ngrams(tokens):
+        return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+    c, r = ngrams(_tokens(candidate)), ngrams(_tokens(reference))
+    return _f1(sum((c & r).values()), sum(c.values()), sum(r.values()))
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """ROUGE-L F1 (longest common subsequence of words)"""
+    c, r = _tokens(candidate), _tokens(reference)
+    if not c or not r:
+        return 0.0
+    previous = [0] * (len(r) + 1)
+    for token in c:
+        current = [0]
+        for j, other in enumerate(r):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(c), len(r))
+
+
+def compare_modes(texts: List[str], summarize: Dict[str, Callable[[List[str]], List[str]]],
+                  baseline: str, references: Optional[List[str]] = None, repeats: int = 1) -> List[Dict]:
+    """Latency and ROUGE of each summarization mode against the baseline mode.
+
+    summarize maps a mode name to a function summarizing a list of texts.
+    Each mode is run once untimed (warm-up, model loading), then timed
+    over repeats runs. ROUGE compares every mode's summaries with the
+    baseline's, and with references when given.
+    """
+    outputs = {}
+    timings = {}
+    for name, run in summarize.items():
+        run(texts[:1])
+        start = time.perf_counter()
+        for _ in range(repeats):
+            outputs[name] = run(texts)
+        timings[name] = (time.perf_counter() - start) / repeats
+
+    report = []
+    for name in summarize:
+        row = {
+            'mode': name,
+            'seconds': timings[name],
+            'seconds_per_text': timings[name] / len(texts),
+            'speedup': timings[baseline] / timings[name] if timings[name] else 0.0,
+        }
+        pairs = list(zip(outputs[name], outputs[baseline]))
+        row['rouge1_vs_baseline'] = sum(rouge_n(c, b, 1) for c, b in pairs) / len(pairs)
+        row['rouge2_vs_baseline'] = sum(rouge_n(c, b, 2) for c, b in pairs) / len(pairs)
+        row['rougeL_vs_baseline'] = sum(rouge_l(c, b) for c, b in pairs) / len(pairs)
+        if references:
+            pairs = list(zip(outputs[name], references))
+            row['rouge1_vs_reference'] = sum(rouge_n(c, r, 1) for c, r in pairs) / len(pairs)
+            row['rougeL_vs_reference'] = sum(rouge_l(c, r) for c, r in pairs) / len(pairs)
+        report.append(row)
+    return report
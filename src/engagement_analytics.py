@@ -0,0 +1,146 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+METRICS = ('engagement', 'views_per_hour', 'acceleration', 'velocity_zscore')
+
+
+def _series_keys(frame: pd.DataFrame) -> List[str]:
+    """Columns identifying one snapshot series: a video, per region when known"""
+    return ['region', 'video_id'] if 'region' in frame.columns else ['video_id']
+
+
+def _series_starts(frame: pd.DataFrame, keys: List[str]) -> np.ndarray:
+    """True on the first row of each series in a frame sorted by keys"""
+    starts = np.zeros(len(frame), dtype=bool)
+    starts[0] = True
+    for key in keys:
+        values = frame[key].to_numpy()
+        starts[1:] |= values[1:] != values[:-1]
+    return starts
+
+
+def engagement_rates(views, likes, comments) -> np.ndarray:
+    """(likes + comments) / views * 100 for whole arrays; 0 where views is 0"""
+    views = np.asarray(views, dtype=np.float64)
+    interactions = np.asarray(likes, dtype=np.float64) + np.asarray(comments, dtype=np.float64)
+    return np.round(np.divide(interactions * 100, views, out=np.zeros_like(views), where=views > 0), 2)
+
+
+class EngagementAnalytics:
+    """Vectorized growth and engagement metrics over statistics snapshots.
+
+    Input is a frame with one row per (video_id, captured_at) snapshot and
+    view_count / like_count / comment_count columns, as returned by
+    SnapshotStore.query. When a region column is present, each
+    (region, video_id) pair is a separate series, since the same video
+    can be captured in several regions' charts. Every metric is computed
+    for all videos in one pass of NumPy operations over the sorted
+    columns; there is no Python loop or groupby().apply per video.
+    """
+
+    def __init__(self, zscore_window: int = 6):
+        self.zscore_window = zscore_window
+
+    def compute(self, snapshots: pd.DataFrame) -> pd.DataFrame:
+        """Add engagement, views_per_hour, acceleration and velocity_zscore columns.
+
+        views_per_hour is the view delta over the time since the previous
+        snapshot of the same video (or, for a video's first snapshot, views
+        since publication when published_at is known). acceleration is the
+        change in views_per_hour per hour. velocity_zscore compares each
+        views_per_hour with the video's own previous zscore_window values.
+        """
+        keys = _series_keys(snapshots)
+        frame = snapshots.sort_values(keys + ['captured_at'], kind='stable').reset_index(drop=True)
+        n = len(frame)
+        if n == 0:
+            for metric in METRICS:
+                frame[metric] = pd.Series(dtype=np.float64)
+            return frame
+
+        starts = _series_starts(frame, keys)
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+
+        views = frame['view_count'].to_numpy(dtype=np.float64)
+        captured = frame['captured_at'].to_numpy(dtype='datetime64[ns]').astype(np.int64) / 3.6e12  # hours
+
+        frame['engagement'] = engagement_rates(views, frame['like_count'], frame['comment_count'])
+
+        hours = np.full(n, np.nan)
+        hours[1:] = np.diff(captured)
+        delta_views = np.full(n, np.nan)
+        delta_views[1:] = np.diff(views)
+        hours[starts] = np.nan
+
+        if 'published_at' in frame.columns:
+            published = frame['published_at'].to_numpy(dtype='datetime64[ns]')
+            known = starts & ~np.isnat(published)
+            hours[known] = captured[known] - published[known].astype(np.int64) / 3.6e12
+            delta_views[known] = views[known]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            velocity = np.where(hours > 0, delta_views / hours, np.nan)
+
+            previous_velocity = np.full(n, np.nan)
+            previous_velocity[1:] = velocity[:-1]
+            previous_velocity[starts] = np.nan
+            acceleration = np.where(hours > 0, (velocity - previous_velocity) / hours, np.nan)
+
+        frame['views_per_hour'] = velocity
+        frame['acceleration'] = acceleration
+        frame['velocity_zscore'] = self._rolling_zscore(velocity, group_start)
+        return frame
+
+    def top_k(self, metrics: pd.DataFrame, k: int = 10, by: str = 'views_per_hour',
+              group_by: Optional[str] = None) -> pd.DataFrame:
+        """Rank each series' latest snapshot by a metric, optionally within groups.
+
+        metrics is the output of compute(), so a video charting in several
+        regions has one latest row per region. With group_by (e.g.
+        'region'), the top k of every group are returned.
+        """
+        if metrics.empty:
+            return metrics.assign(rank=pd.Series(dtype=np.int64))
+
+        last = np.ones(len(metrics), dtype=bool)
+        last[:-1] = _series_starts(metrics, _series_keys(metrics))[1:]
+        latest = metrics[last & ~np.isnan(metrics[by].to_numpy(dtype=np.float64))]
+
+        if group_by is None:
+            values = latest[by].to_numpy(dtype=np.float64)
+            if len(values) > k:
+                # O(n) selection, then sort only the k winners
+                latest = latest.iloc[np.argpartition(-values, k - 1)[:k]]
+            ranked = latest.sort_values(by, ascending=False, kind='stable')
+            return ranked.assign(rank=np.arange(1, len(ranked) + 1)).reset_index(drop=True)
+
+        ranked = latest.sort_values([group_by, by], ascending=[True, False], kind='stable')
+        ranked = ranked.groupby(group_by, sort=False).head(k)
+        ranked = ranked.assign(rank=ranked.groupby(group_by, sort=False).cumcount() + 1)
+        return ranked.reset_index(drop=True)
+
+    def _rolling_zscore(self, values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+        """z-score of each value against the preceding window of its own group.
+
+        The window is small, so it is gathered with one vectorized pass per
+        lag (window passes over the whole array) rather than per video.
+        """
+        n = len(values)
+        index = np.arange(n)
+        lags = []
+        for lag in range(1, self.zscore_window + 1):
+            source = index - lag
+            lagged = np.full(n, np.nan)
+            inside = source >= group_start
+            lagged[inside] = values[source[inside]]
+            lags.append(lagged)
+
+        history = np.vstack(lags)
+        count = np.sum(~np.isnan(history), axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.nansum(history, axis=0) / count
+            std = np.sqrt(np.nansum((history - mean) ** 2, axis=0) / count)
+            zscore = np.where((count >= 2) & (std > 0), (values - mean) / std, np.nan)
+        return zscore
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+DEFAULT_MEDIA_PATH = os.getenv('MEDIA_CACHE_PATH', os.path.join('.cache', 'media'))
+DEFAULT_MEDIA_MAX_BYTES = int(os.getenv('MEDIA_CACHE_MAX_BYTES', 2 * 1024 ** 3))
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MediaStore:
+    """On-disk store of downloaded audio and Whisper transcripts.
+
+    Audio files are stored once under the SHA-256 of their contents and
+    mapped from the video they were downloaded for. Transcripts are keyed
+    by video, Whisper model and transcription options. Audio files and
+    transcripts share one disk budget, max_bytes, and the least recently
+    used are evicted first. A single instance may be shared between threads.
+    """
+
+    def __init__(self, root: str = DEFAULT_MEDIA_PATH, max_bytes: int = DEFAULT_MEDIA_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'audio'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'tmp'), exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(root, 'index.db'), timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS audio (
+                    digest TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS video_audio (
+                    video_id TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    key TEXT PRIMARY KEY,
+                    video_id TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+
+    def temp_dir(self) -> str:
+        """A scratch directory on the store's filesystem, so put_audio can move rather than copy"""
+        return os.path.join(self.root, 'tmp')
+
+    @staticmethod
+    def transcript_key(video_id: str, model_name: str, options: Optional[Dict] = None) -> str:
+        payload = json.dumps([video_id, model_name, options or {}], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_transcript(self, video_id: str, model_name: str, options: Optional[Dict] = None) -> Optional[str]:
+        key = self.transcript_key(video_id, model_name, options)
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM transcripts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE transcripts SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put_transcript(self, video_id: str, model_name: str, text: str, options: Optional[Dict] = None):
+        key = self.transcript_key(video_id, model_name, options)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, video_id, text, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, video_id, text, len(text.encode('utf-8')), time.time())
+            )
+            self._evict()
+
+    def get_audio(self, video_id: str) -> Optional[str]:
+        """Path of the stored audio for a video, if it is still on disk"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT a.digest, a.path FROM video_audio v JOIN audio a ON a.digest = v.digest "
+                "WHERE v.video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            digest, path = row
+            if not os.path.exists(path):
+                with self._conn:
+                    self._conn.execute("DELETE FROM audio WHERE digest = ?", (digest,))
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE audio SET accessed_at = ? WHERE digest = ?", (time.time(), digest))
+        return path
+
+    def put_audio(self, video_id: str, source_path: str) -> str:
+        """Move a downloaded audio file into the store; returns its stored path.
+
+        Identical audio downloaded for different video IDs is kept once.
+        """
+        digest = file_digest(source_path)
+        extension = os.path.splitext(source_path)[1]
+        path = os.path.join(self.root, 'audio', digest[:2], digest + extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._lock, self._conn:
+            if os.path.exists(path):
+                os.remove(source_path)
+            else:
+                shutil.move(source_path, path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO audio (digest, path, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (digest, path, os.path.getsize(path), time.time())
+            )
+            self._conn.execute("INSERT OR REPLACE INTO video_audio (video_id, digest) VALUES (?, ?)",
+                               (video_id, digest))
+            self._evict(keep=digest)
+        return path
+
+    def usage(self) -> int:
+        """Bytes used by stored audio and transcripts"""
+        with self._lock:
+            return self._total()
+
+    def _total(self) -> int:
+        return self._conn.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM audio) + (SELECT COALESCE(SUM(size), 0) FROM transcripts)"
+        ).fetchone()[0]
+
+    def _evict(self, keep: Optional[str] = None):
+        """Drop least-recently-used audio and transcripts until under max_bytes (lock held)"""
+        total = self._total()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("""
+            SELECT 'audio', digest, path, size, accessed_at FROM audio
+            UNION ALL
+            SELECT 'transcript', key, NULL, size, accessed_at FROM transcripts
+            ORDER BY accessed_at
+        """).fetchall()
+        for kind, key, path, size, _ in rows:
+            if total <= self.max_bytes:
+                break
+            if kind == 'audio':
+                if key == keep:
+                    continue
+                if os.path.exists(path):
+                    os.remove(path)
+                self._conn.execute("DELETE FROM audio WHERE digest = ?", (key,))
+                self._conn.execute("DELETE FROM video_audio WHERE digest = ?", (key,))
+            else:
+                self._conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            total -= size
@@ -0,0 +1,143 @@
+import gc
+import os
+import sys
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Seconds an unreferenced model stays loaded before it is unloaded;
+# 0 or less keeps models for the life of the process
+DEFAULT_IDLE_TIMEOUT = float(os.getenv('MODEL_IDLE_TIMEOUT', 15 * 60))
+
+
+@dataclass
+class _Entry:
+    model: Any = None
+    refs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    loaded: threading.Event = field(default_factory=threading.Event)
+    error: Optional[BaseException] = None
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded ML models, shared by reference count.
+
+    acquire() loads a model on first use and hands the same object to
+    every later caller; release() drops a reference. A model nobody
+    references is kept for idle_timeout seconds, so the next analysis
+    (another Streamlit rerun or session) reuses it instead of reloading
+    the weights, and is then unloaded by a background reaper.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the model for key, calling loader() if it is not loaded yet.
+
+        Concurrent first calls for the same key wait for a single load;
+        different keys load in parallel.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry()
+            entry.refs += 1
+
+        if owner:
+            try:
+                entry.model = loader()
+            except BaseException as e:
+                with self._lock:
+                    entry.error = e
+                    self._entries.pop(key, None)
+                entry.loaded.set()
+                raise
+            entry.loaded.set()
+        else:
+            entry.loaded.wait()
+            if entry.error is not None:
+                raise entry.error
+        return entry.model
+
+    def release(self, key: Hashable):
+        """Drop one reference; the model is unloaded once idle for idle_timeout"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            entry.last_used = time.monotonic()
+            if entry.refs == 0:
+                self._start_reaper()
+
+    def unload_idle(self, max_idle: Optional[float] = None) -> int:
+        """Unload unreferenced models idle for at least max_idle seconds; returns the count"""
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        now = time.monotonic()
+        with self._lock:
+            idle = [key for key, entry in self._entries.items()
+                    if entry.refs == 0 and entry.loaded.is_set() and now - entry.last_used >= max_idle]
+            models = [self._entries.pop(key).model for key in idle]
+
+        for model in models:
+            # Models that own resources (e.g. worker processes) release them
+            close = getattr(model, 'close', None)
+            if callable(close):
+                close()
+        if idle:
+            gc.collect()
+            _empty_device_cache()
+        return len(idle)
+
+    def loaded(self) -> Dict[Hashable, int]:
+        """Reference count of every loaded model, keyed by model key"""
+        with self._lock:
+            return {key: entry.refs for key, entry in self._entries.items() if entry.loaded.is_set()}
+
+    def _start_reaper(self):
+        # Called with self._lock held. No new threads while the interpreter
+        # shuts down (summarizers are released by __del__ at exit).
+        if self.idle_timeout <= 0 or sys.is_finalizing():
+            return
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap, name='model-registry-reaper', daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(max(self.idle_timeout / 4, 1.0))
+            self.unload_idle()
+            with self._lock:
+                if all(entry.refs for entry in self._entries.values()):
+                    # Nothing left to unload; release() starts a new reaper when needed
+                    self._reaper = None
+                    return
+
+
+def _empty_device_cache():
+    try:
+        import torch
+    except ImportError:
+        return
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """The process-wide registry shared by every VideoSummarizer"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
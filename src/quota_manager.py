@@ -0,0 +1,181 @@
+import os
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo('America/Los_Angeles')
+except Exception:  # no tz database available
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+DEFAULT_QUOTA_PATH = os.getenv('YOUTUBE_QUOTA_PATH', os.path.join('.cache', 'youtube_quota.db'))
+DAILY_QUOTA = 10000
+# Client-side request rate cap; the API itself only enforces the daily
+# quota, so 0 (the default) leaves requests unthrottled
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv('YOUTUBE_REQUESTS_PER_SECOND', 0))
+DEFAULT_BURST = 20
+
+# Quota units charged per call, from the YouTube Data API v3 cost table
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'commentThreads.list': 1,
+    'comments.list': 1,
+}
+DEFAULT_COST = 1
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call would exceed (or the API reports) the daily quota"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to smooth request bursts"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """Block until the requested number of tokens is available"""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class QuotaManager:
+    """Tracks daily YouTube API quota across processes and rate-limits calls.
+
+    Consumed units are stored per quota day (the API resets at midnight
+    Pacific time) in a small SQLite database, so separate CLI runs,
+    Streamlit sessions and daemons draw from the same budget. Calls are
+    additionally spread out to requests_per_second when that is set.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUOTA_PATH, daily_limit: int = DAILY_QUOTA,
+                 costs: Optional[Dict[str, int]] = None,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST):
+        self.path = path
+        self.daily_limit = daily_limit
+        self.costs = dict(QUOTA_COSTS, **(costs or {}))
+        self.bucket = None
+        self._lock = threading.Lock()
+        self.set_rate_limit(requests_per_second, burst)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS usage (
+                day TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                units INTEGER NOT NULL,
+                calls INTEGER NOT NULL,
+                PRIMARY KEY (day, endpoint)
+            )
+        """)
+
+    @staticmethod
+    def quota_day() -> str:
+        return datetime.now(_QUOTA_TZ).strftime('%Y-%m-%d')
+
+    def cost(self, endpoint: str) -> int:
+        return self.costs.get(endpoint, DEFAULT_COST)
+
+    def used(self) -> int:
+        """Units consumed so far in the current quota day"""
+        with self._lock:
+            return self._used(self.quota_day())
+
+    def remaining(self) -> int:
+        """Units left in the current quota day"""
+        return max(0, self.daily_limit - self.used())
+
+    def can_afford(self, endpoint: str, calls: int = 1) -> bool:
+        """Whether the given number of calls to endpoint fit the remaining budget"""
+        return self.cost(endpoint) * calls <= self.remaining()
+
+    def usage_by_endpoint(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, units FROM usage WHERE day = ?", (self.quota_day(),)
+            ).fetchall()
+        return dict(rows)
+
+    def set_rate_limit(self, requests_per_second: float, burst: int = DEFAULT_BURST):
+        """Cap calls at requests_per_second (0 or less removes the cap)"""
+        with self._lock:
+            bucket = self.bucket
+            if bucket is not None and bucket.rate == requests_per_second and bucket.capacity == burst:
+                return
+            self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second > 0 else None
+
+    def acquire(self, endpoint: str):
+        """Charge one call to endpoint, waiting on the rate limiter.
+
+        Raises QuotaExceededError without charging anything if the call
+        does not fit in today's remaining budget.
+        """
+        cost = self.cost(endpoint)
+        day = self.quota_day()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._used(day) + cost > self.daily_limit:
+                    raise QuotaExceededError(
+                        f"Daily YouTube quota exhausted: {endpoint} needs {cost} units, "
+                        f"{max(0, self.daily_limit - self._used(day))} remaining"
+                    )
+                self._record(day, endpoint, cost)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        bucket = self.bucket
+        if bucket is not None:
+            bucket.acquire()
+
+    def mark_exhausted(self):
+        """Record that the API itself reported the quota as exceeded"""
+        day = self.quota_day()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                shortfall = self.daily_limit - self._used(day)
+                if shortfall > 0:
+                    self._record(day, '_reported_exhausted', shortfall)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _used(self, day: str) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(units), 0) FROM usage WHERE day = ?", (day,)
+        ).fetchone()[0]
+
+    def _record(self, day: str, endpoint: str, units: int):
+        self._conn.execute(
+            "INSERT INTO usage (day, endpoint, units, calls) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT (day, endpoint) DO UPDATE SET units = units + excluded.units, calls = calls + 1",
+            (day, endpoint, units)
+        )
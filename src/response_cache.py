@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = os.getenv('YOUTUBE_CACHE_PATH', os.path.join('.cache', 'youtube_responses.db'))
+
+# Seconds a cached response is served without contacting the API. Once an
+# entry is older than this it is revalidated with If-None-Match instead.
+DEFAULT_TTLS = {
+    'channels.list': 24 * 3600,
+    'playlistItems.list': 10 * 60,
+    'videos.list': 30 * 60,
+    'commentThreads.list': 30 * 60,
+    'comments.list': 30 * 60,
+    'search.list': 30 * 60,
+}
+DEFAULT_TTL = 15 * 60
+
+
+@dataclass
+class CachedResponse:
+    body: Dict
+    etag: Optional[str]
+    fresh: bool
+
+
+class ResponseCache:
+    """SQLite-backed cache of YouTube API responses keyed by endpoint and parameters.
+
+    Entries are evicted least-recently-used first once the stored bodies
+    exceed max_bytes. A single instance may be shared between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 100 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        payload = json.dumps([endpoint, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def get(self, endpoint: str, params: Dict) -> Optional[CachedResponse]:
+        """Look up a response; fresh is False once its TTL has passed"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        body, etag, stored_at = row
+        return CachedResponse(
+            body=json.loads(body),
+            etag=etag,
+            fresh=now - stored_at < self.ttl_for(endpoint)
+        )
+
+    def put(self, endpoint: str, params: Dict, body: Dict):
+        """Store a response and evict old entries if over budget"""
+        key = self.make_key(endpoint, params)
+        data = json.dumps(body)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, etag, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, data, body.get('etag'), len(data), now, now)
+            )
+            self._evict()
+
+    def refresh(self, endpoint: str, params: Dict):
+        """Restart the TTL of an entry the API confirmed as unchanged (304)"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def _evict(self):
+        """Drop least-recently-used entries until under max_bytes (lock held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        expired = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", expired)
@@ -0,0 +1,93 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from audio_utils import SAMPLE_RATE, split_on_silence
+
+# Longest audio segment handed to one worker, in seconds
+DEFAULT_SEGMENT_SECONDS = 300
+
+# Per-process Whisper model, loaded once by each pool worker
+_worker_model = None
+
+
+def _init_worker(model_name: str, threads: int, quantize: bool):
+    global _worker_model
+    import torch
+    import whisper
+
+    # Each worker gets its share of the cores instead of all of them
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    _worker_model = whisper.load_model(model_name, device='cpu')
+    if quantize:
+        from cpu_inference import quantize_whisper
+        _worker_model = quantize_whisper(_worker_model)
+
+
+def _transcribe_segment(audio: np.ndarray, options: Dict) -> Dict:
+    return _worker_model.transcribe(audio, **options)
+
+
+def stitch_segments(results: List[Dict], offsets: List[float]) -> Dict:
+    """Join per-segment Whisper results, shifting timestamps by each segment's offset"""
+    segments = []
+    for result, offset in zip(results, offsets):
+        for segment in result.get('segments', []):
+            segments.append({
+                'start': round(segment['start'] + offset, 3),
+                'end': round(segment['end'] + offset, 3),
+                'text': segment['text'].strip()
+            })
+    text = " ".join(result['text'].strip() for result in results if result['text'].strip())
+    return {'text': text, 'segments': segments}
+
+
+class SegmentedTranscriber:
+    """Transcribes long audio as silence-aligned segments across a process pool.
+
+    Each worker process loads its own Whisper model (on CPU) and is capped
+    at threads_per_worker torch threads, so workers share the cores instead
+    of oversubscribing them. Segments are transcribed in parallel and
+    stitched back in order with timestamps on the original timeline.
+    """
+
+    def __init__(self, model_name: str = 'base', workers: Optional[int] = None,
+                 threads_per_worker: Optional[int] = None,
+                 segment_seconds: float = DEFAULT_SEGMENT_SECONDS, quantize: bool = False):
+        cpus = os.cpu_count() or 1
+        self.model_name = model_name
+        self.workers = workers or cpus
+        self.threads_per_worker = threads_per_worker or max(cpus // self.workers, 1)
+        self.segment_seconds = segment_seconds
+        self.quantize = quantize
+        self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # torch does not survive fork reliably; start clean interpreters
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.quantize)
+            )
+        return self._executor
+
+    def transcribe(self, audio: np.ndarray, options: Optional[Dict] = None) -> Dict:
+        """Transcribe 16 kHz float32 samples; returns {'text', 'segments'}"""
+        options = options or {}
+        ranges = split_on_silence(audio, self.segment_seconds)
+        pool = self._pool()
+        futures = [pool.submit(_transcribe_segment, audio[start:end], options) for start, end in ranges]
+        results = [future.result() for future in futures]
+        return stitch_segments(results, [start / SAMPLE_RATE for start, _ in ranges])
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,132 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DEFAULT_SNAPSHOT_PATH = os.getenv('YOUTUBE_SNAPSHOT_PATH', 'snapshots')
+
+SNAPSHOT_SCHEMA = pa.schema([
+    ('captured_at', pa.timestamp('us', tz='UTC')),
+    ('video_id', pa.string()),
+    ('published_at', pa.timestamp('us', tz='UTC')),
+    ('view_count', pa.int64()),
+    ('like_count', pa.int64()),
+    ('comment_count', pa.int64()),
+    ('source', pa.string()),
+])
+
+# Hive-style directories: <root>/date=YYYY-MM-DD/region=XX/<file>.parquet
+PARTITIONING = ds.partitioning(
+    pa.schema([('date', pa.string()), ('region', pa.string())]), flavor='hive'
+)
+
+
+def _utc(value: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class SnapshotStore:
+    """Append-only Parquet store of per-video statistics snapshots.
+
+    Each record() call writes one zstd-compressed Parquet file into a
+    date/region partition. query() prunes partitions by date and region
+    and pushes the remaining filters and column selection down into the
+    scan, so range queries read only the matching row groups and columns
+    and never load the whole history.
+    """
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOT_PATH, compression: str = 'zstd'):
+        self.root = root
+        self.compression = compression
+        os.makedirs(root, exist_ok=True)
+
+    def record(self, videos: List[Dict], region: str = 'US', source: str = 'trending',
+               captured_at: Optional[datetime] = None) -> int:
+        """Append one snapshot of the videos' statistics; returns rows written"""
+        if not videos:
+            return 0
+
+        captured_at = _utc(captured_at) or datetime.now(timezone.utc)
+        table = pa.table({
+            'captured_at': [captured_at] * len(videos),
+            'video_id': [v['video_id'] for v in videos],
+            'published_at': [_utc(v.get('published_at')) for v in videos],
+            'view_count': [int(v.get('view_count', 0)) for v in videos],
+            'like_count': [int(v.get('like_count', 0)) for v in videos],
+            'comment_count': [int(v.get('comment_count', 0)) for v in videos],
+            'source': [source] * len(videos),
+        }, schema=SNAPSHOT_SCHEMA)
+
+        directory = os.path.join(self.root, f"date={captured_at:%Y-%m-%d}", f"region={region}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{captured_at:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+        pq.write_table(table, path, compression=self.compression)
+        return table.num_rows
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(self.root, format='parquet', partitioning=PARTITIONING)
+
+    def query(self, start: Optional[Union[str, datetime]] = None, end: Optional[Union[str, datetime]] = None,
+              video_ids: Optional[List[str]] = None, regions: Optional[List[str]] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Snapshots captured in [start, end) as a DataFrame, sorted by video and time"""
+        start, end = _utc(start), _utc(end)
+        conditions = []
+        if start is not None:
+            conditions.append(ds.field('date') >= f"{start:%Y-%m-%d}")
+            conditions.append(ds.field('captured_at') >= pa.scalar(start, SNAPSHOT_SCHEMA.field('captured_at').type))
+        if end is not None:
+            conditions.append(ds.field('date') <= f"{end:%Y-%m-%d}")
+            conditions.append(ds.field('captured_at') < pa.scalar(end, SNAPSHOT_SCHEMA.field('captured_at').type))
+        if video_ids is not None:
+            conditions.append(ds.field('video_id').isin(video_ids))
+        if regions is not None:
+            conditions.append(ds.field('region').isin(regions))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        if columns is not None:
+            # Keys needed to identify and order each row
+            columns = list(dict.fromkeys(['video_id', 'captured_at'] + list(columns)))
+
+        table = self.dataset().to_table(columns=columns, filter=expression)
+        if table.num_rows == 0:
+            return table.to_pandas()
+
+        indices = pc.sort_indices(table, sort_keys=[('video_id', 'ascending'), ('captured_at', 'ascending')])
+        return table.take(indices).to_pandas()
+
+    def compact(self, date: str):
+        """Merge a day's small per-snapshot files into one file per region"""
+        day_dir = os.path.join(self.root, f"date={date}")
+        if not os.path.isdir(day_dir):
+            return
+
+        for region_dir in sorted(os.listdir(day_dir)):
+            directory = os.path.join(day_dir, region_dir)
+            files = sorted(f for f in os.listdir(directory) if f.endswith('.parquet'))
+            if len(files) < 2:
+                continue
+
+            table = pa.concat_tables(pq.read_table(os.path.join(directory, f), schema=SNAPSHOT_SCHEMA)
+                                     for f in files)
+            table = table.take(pc.sort_indices(table, sort_keys=[('video_id', 'ascending'),
+                                                                 ('captured_at', 'ascending')]))
+            merged = os.path.join(directory, f"compacted-{uuid.uuid4().hex[:8]}.parquet")
+            pq.write_table(table, merged, compression=self.compression)
+            for f in files:
+                os.remove(os.path.join(directory, f))
@@ -0,0 +1,283 @@
+import os
+import json
+import glob
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_STATE_PATH = os.getenv('YOUTUBE_STATE_PATH', 'monitor_state.db')
+
+# Keep IN (...) lists below SQLite's default bound-parameter limit
+_SQL_BATCH = 500
+
+_STATS_KEYS = ('view_count', 'like_count', 'comment_count')
+
+
+class StateStore:
+    """Embedded SQLite store for channel monitoring state.
+
+    Replaces the per-channel channel_state_<id>.json files: each known
+    video is one indexed row, so a check only touches the videos it just
+    fetched, and upserts run in a transaction so concurrent checks cannot
+    corrupt the state.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS channels (
+                channel_id TEXT PRIMARY KEY,
+                last_check TEXT
+            );
+            CREATE TABLE IF NOT EXISTS channel_videos (
+                channel_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                title TEXT,
+                published_at TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                last_stats TEXT,
+                PRIMARY KEY (channel_id, video_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_channel_videos_first_seen
+                ON channel_videos (channel_id, first_seen);
+            CREATE INDEX IF NOT EXISTS idx_channel_videos_published
+                ON channel_videos (channel_id, published_at);
+            CREATE TABLE IF NOT EXISTS saved_searches (
+                search_key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                filters TEXT NOT NULL,
+                watermark TEXT,
+                last_run TEXT
+            );
+            CREATE TABLE IF NOT EXISTS search_results (
+                search_key TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                published_at TEXT,
+                first_seen TEXT NOT NULL,
+                PRIMARY KEY (search_key, video_id)
+            );
+        """)
+        self._ensure_columns('channels', {
+            'poll_interval_minutes': 'REAL',
+            'next_check': 'TEXT',
+            'watermark': 'TEXT',
+        })
+
+    def has_channel(self, channel_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM channels WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        return row is not None
+
+    def get_channel(self, channel_id: str) -> Dict:
+        """Channel row as a dict (empty if the channel was never checked)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM channels WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        return dict(row) if row else {}
+
+    def count_videos(self, channel_id: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM channel_videos WHERE channel_id = ?", (channel_id,)
+            ).fetchone()[0]
+
+    def get_videos(self, channel_id: str, since: Optional[str] = None) -> List[Dict]:
+        """Known videos of a channel, newest first, optionally first seen after since"""
+        query = "SELECT * FROM channel_videos WHERE channel_id = ?"
+        params = [channel_id]
+        if since:
+            query += " AND first_seen > ?"
+            params.append(since)
+        query += " ORDER BY published_at DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        videos = []
+        for row in rows:
+            video = dict(row)
+            video['last_stats'] = json.loads(video['last_stats']) if video['last_stats'] else {}
+            videos.append(video)
+        return videos
+
+    def count_uploads_since(self, channel_id: str, since: str) -> int:
+        """Number of known videos published at or after since (RFC 3339)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM channel_videos WHERE channel_id = ? AND published_at >= ?",
+                (channel_id, since)
+            ).fetchone()[0]
+
+    def set_schedule(self, channel_id: str, interval_minutes: float, next_check: str):
+        """Persist a channel's polling interval and next due time"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO channels (channel_id, poll_interval_minutes, next_check) VALUES (?, ?, ?) "
+                "ON CONFLICT (channel_id) DO UPDATE SET "
+                "poll_interval_minutes = excluded.poll_interval_minutes, next_check = excluded.next_check",
+                (channel_id, interval_minutes, next_check)
+            )
+
+    def record_videos(self, channel_id: str, videos: List[Dict],
+                      checked_at: Optional[str] = None) -> List[Dict]:
+        """Upsert fetched videos and return the ones not seen before.
+
+        Only the IDs in videos are looked up, so the cost is proportional
+        to the batch size, not to the channel's history. The channel's
+        watermark advances to the latest published_at in the batch.
+        """
+        checked_at = checked_at or datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                known = self._known_ids(channel_id, [v['video_id'] for v in videos])
+                new_videos = [v for v in videos if v['video_id'] not in known]
+                self._upsert_videos(channel_id, videos, checked_at)
+                watermark = max((v['published_at'] for v in videos if v.get('published_at')), default=None)
+                self._conn.execute(
+                    "INSERT INTO channels (channel_id, last_check, watermark) VALUES (?, ?, ?) "
+                    "ON CONFLICT (channel_id) DO UPDATE SET last_check = excluded.last_check, "
+                    "watermark = MAX(COALESCE(channels.watermark, ''), COALESCE(excluded.watermark, ''))",
+                    (channel_id, checked_at, watermark)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        # A video listed twice in one batch is only new once
+        return list({v['video_id']: v for v in new_videos}.values())
+
+    @staticmethod
+    def search_key(query: str, filters: Dict) -> str:
+        payload = json.dumps([query, filters], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get_saved_search(self, query: str, filters: Dict) -> Dict:
+        """Saved search row as a dict (empty if the search never ran)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM saved_searches WHERE search_key = ?", (self.search_key(query, filters),)
+            ).fetchone()
+        return dict(row) if row else {}
+
+    def record_search_results(self, query: str, filters: Dict, videos: List[Dict],
+                              checked_at: Optional[str] = None) -> List[Dict]:
+        """Store a saved search's results and return the ones not reported before"""
+        key = self.search_key(query, filters)
+        checked_at = checked_at or datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                known = set()
+                video_ids = [v['video_id'] for v in videos]
+                for start in range(0, len(video_ids), _SQL_BATCH):
+                    batch = video_ids[start:start + _SQL_BATCH]
+                    placeholders = ','.join('?' * len(batch))
+                    rows = self._conn.execute(
+                        f"SELECT video_id FROM search_results WHERE search_key = ? AND video_id IN ({placeholders})",
+                        [key] + batch
+                    ).fetchall()
+                    known.update(row[0] for row in rows)
+
+                new_videos = list({v['video_id']: v for v in videos if v['video_id'] not in known}.values())
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO search_results (search_key, video_id, published_at, first_seen) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, v['video_id'], v.get('published_at'), checked_at) for v in new_videos]
+                )
+
+                watermark = max((v['published_at'] for v in videos if v.get('published_at')), default=None)
+                self._conn.execute(
+                    "INSERT INTO saved_searches (search_key, query, filters, watermark, last_run) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (search_key) DO UPDATE SET last_run = excluded.last_run, "
+                    "watermark = MAX(COALESCE(saved_searches.watermark, ''), COALESCE(excluded.watermark, ''))",
+                    (key, query, json.dumps(filters, sort_keys=True, default=str), watermark, checked_at)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return new_videos
+
+    def migrate_json_state(self, state_file: str, channel_id: Optional[str] = None) -> int:
+        """Import a legacy channel_state_<id>.json file; returns videos imported"""
+        if channel_id is None:
+            name = os.path.basename(state_file)
+            channel_id = name[len('channel_state_'):-len('.json')]
+
+        try:
+            with open(state_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading state file {state_file}: {e}")
+            return 0
+
+        videos = [v for v in data.get('videos', []) if v.get('video_id')]
+        self.record_videos(channel_id, videos, checked_at=data.get('last_check'))
+        return len(videos)
+
+    def migrate_json_states(self, directory: str = '.') -> Dict[str, int]:
+        """Import every channel_state_*.json in directory; safe to run repeatedly"""
+        imported = {}
+        for state_file in sorted(glob.glob(os.path.join(directory, 'channel_state_*.json'))):
+            channel_id = os.path.basename(state_file)[len('channel_state_'):-len('.json')]
+            imported[channel_id] = self.migrate_json_state(state_file, channel_id)
+        return imported
+
+    def _ensure_columns(self, table: str, columns: Dict[str, str]):
+        """Add columns introduced after a database was first created"""
+        existing = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def _known_ids(self, channel_id: str, video_ids: List[str]) -> set:
+        known = set()
+        for start in range(0, len(video_ids), _SQL_BATCH):
+            batch = video_ids[start:start + _SQL_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT video_id FROM channel_videos WHERE channel_id = ? AND video_id IN ({placeholders})",
+                [channel_id] + batch
+            ).fetchall()
+            known.update(row[0] for row in rows)
+        return known
+
+    def _upsert_videos(self, channel_id: str, videos: List[Dict], checked_at: str):
+        rows = []
+        for video in videos:
+            stats = {k: video[k] for k in _STATS_KEYS if k in video}
+            rows.append((
+                channel_id, video['video_id'], video.get('title'), video.get('published_at'),
+                checked_at, checked_at, json.dumps(stats) if stats else None
+            ))
+
+        self._conn.executemany(
+            "INSERT INTO channel_videos "
+            "(channel_id, video_id, title, published_at, first_seen, last_seen, last_stats) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (channel_id, video_id) DO UPDATE SET "
+            "title = COALESCE(excluded.title, channel_videos.title), "
+            "published_at = COALESCE(excluded.published_at, channel_videos.published_at), "
+            "last_seen = excluded.last_seen, "
+            "last_stats = COALESCE(excluded.last_stats, channel_videos.last_stats)",
+            rows
+        )
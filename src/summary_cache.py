@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_SUMMARY_CACHE_PATH = os.getenv('SUMMARY_CACHE_PATH', os.path.join('.cache', 'summaries.db'))
+
+
+class SummaryCache:
+    """SQLite-backed store of generated summaries keyed by a hash of their inputs.
+
+    A key covers the input text, the model and every generation setting,
+    so a stored summary is only reused for an identical request. Entries
+    are evicted least-recently-used first once the stored summaries exceed
+    max_bytes. A single instance may be shared between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_SUMMARY_CACHE_PATH, max_bytes: int = 50 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)")
+
+    @staticmethod
+    def make_key(text: str, model_name: str, params: Dict) -> str:
+        payload = json.dumps([model_name, params, text], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Stored summaries for whichever of keys are present"""
+        found = {}
+        now = time.time()
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", batch
+                ).fetchall())
+            if found:
+                with self._conn:
+                    self._conn.executemany("UPDATE summaries SET accessed_at = ? WHERE key = ?",
+                                           [(now, key) for key in found])
+        return found
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, summaries: Dict[str, str]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, summary, len(summary.encode('utf-8')), now, now) for key, summary in summaries.items()]
+            )
+            self._evict()
+
+    def put(self, key: str, summary: str):
+        self.put_many({key: summary})
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM summaries")
+
+    def _evict(self):
+        """Drop least-recently-used entries until under max_bytes (lock held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM summaries ORDER BY accessed_at").fetchall()
+        expired = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM summaries WHERE key = ?", expired)
@@ -0,0 +1,82 @@
+import re
+from functools import lru_cache
+from typing import List
+
+# Sentence ends: terminal punctuation followed by whitespace, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Fallback when a tokenizer does not report a usable model_max_length
+DEFAULT_MAX_TOKENS = 1024
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences (and lines, for lists such as comments)"""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+class TokenChunker:
+    """Packs whole sentences into chunks that fill the model's token window.
+
+    Sentence lengths are measured with the model's own tokenizer and
+    cached, so re-chunking the same descriptions and comments does not
+    tokenize them again. A sentence longer than the window is split on
+    token boundaries. With overlap_tokens, each chunk repeats trailing
+    sentences of the previous one, up to that many tokens, for context.
+    """
+
+    def __init__(self, tokenizer, max_tokens: int = None, overlap_tokens: int = 0,
+                 cache_size: int = 16384):
+        self.tokenizer = tokenizer
+        if max_tokens is None:
+            model_max = getattr(tokenizer, 'model_max_length', None) or DEFAULT_MAX_TOKENS
+            max_tokens = min(model_max, DEFAULT_MAX_TOKENS) - tokenizer.num_special_tokens_to_add()
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+        self.count_tokens = lru_cache(maxsize=cache_size)(self._count_tokens)
+
+    def _count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    def chunk(self, text: str) -> List[str]:
+        """Split text into as few chunks of at most max_tokens as sentence boundaries allow"""
+        pieces = []
+        for sentence in split_sentences(text):
+            if self.count_tokens(sentence) > self.max_tokens:
+                pieces.extend(self._split_long(sentence))
+            else:
+                pieces.append(sentence)
+
+        chunks = []
+        current, current_tokens = [], 0
+        for piece in pieces:
+            # +1 for the space joining it to the previous sentence
+            tokens = self.count_tokens(piece) + (1 if current else 0)
+            if current and current_tokens + tokens > self.max_tokens:
+                chunks.append(" ".join(current))
+                current = self._overlap(current)
+                current_tokens = sum(self.count_tokens(s) + 1 for s in current)
+                tokens = self.count_tokens(piece) + (1 if current else 0)
+                if current_tokens + tokens > self.max_tokens:
+                    current, current_tokens, tokens = [], 0, self.count_tokens(piece)
+            current.append(piece)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def _overlap(self, sentences: List[str]) -> List[str]:
+        """Trailing sentences totalling at most overlap_tokens"""
+        carried, total = [], 0
+        for sentence in reversed(sentences):
+            total += self.count_tokens(sentence) + 1
+            if total > self.overlap_tokens:
+                break
+            carried.insert(0, sentence)
+        return carried
+
+    def _split_long(self, sentence: str) -> List[str]:
+        ids = self.tokenizer.encode(sentence, add_special_tokens=False)
+        # Leave a little room: decoded text can re-tokenize slightly longer
+        step = max(self.max_tokens - 8, 1)
+        return [self.tokenizer.decode(ids[i:i + step]).strip() for i in range(0, len(ids), step)]
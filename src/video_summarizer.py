@@ -7,63 +7,219 @@ from typing import Dict, List, Optional
 import requests
 from urllib.parse import urlparse
 import tempfile
+import shutil
 import json
+import threading
+import numpy as np
+
+from model_registry import ModelRegistry, get_registry
+from text_chunker import TokenChunker
+from summary_cache import SummaryCache
+from media_store import MediaStore
+from audio_utils import SAMPLE_RATE, decode_audio, speech_regions, timeline_mapper
+from cpu_inference import (DEFAULT_BACKEND, DEFAULT_INTEROP_THREADS, DEFAULT_QUANTIZE, DEFAULT_TORCH_THREADS,
+                           configure_threads, load_onnx_summarizer, onnx_available,
+                           quantize_linear, quantize_whisper)
+from segmented_transcriber import DEFAULT_SEGMENT_SECONDS, SegmentedTranscriber, stitch_segments
+
+# Chunks per forward pass in batched summarization
+DEFAULT_BATCH_SIZE = int(os.getenv('SUMMARY_BATCH_SIZE', 8))
+# Hierarchical summarization: length of each intermediate (map) summary in
+# tokens, and the most reduce passes before the final summary
+MAP_MAX_LENGTH = 128
+MAP_MIN_LENGTH = 32
+MAX_REDUCE_PASSES = 6
+# With skip_silence, audio is transcribed in full when the speech detector
+# keeps less than this fraction of it (it found no speech it trusts)
+MIN_SPEECH_FRACTION = 0.05
+# Worker processes for segmented transcription of long audio; 1 transcribes in-process
+DEFAULT_TRANSCRIBE_WORKERS = int(os.getenv('TRANSCRIBE_WORKERS', 1))
 
 class VideoSummarizer:
-    def __init__(self, model_name: str = "facebook/bart-large-cnn"):
-        """Initialize the summarization model"""
+    def __init__(self, model_name: str = "facebook/bart-large-cnn", whisper_model_name: str = "base",
+                 registry: Optional[ModelRegistry] = None, chunk_overlap_tokens: int = 0,
+                 summary_cache: Optional[SummaryCache] = None, use_cache: bool = True,
+                 media_store: Optional[MediaStore] = None, transcribe_options: Optional[Dict] = None,
+                 transcribe_workers: int = DEFAULT_TRANSCRIBE_WORKERS,
+                 segment_seconds: float = DEFAULT_SEGMENT_SECONDS, skip_silence: bool = True,
+                 quantize: bool = DEFAULT_QUANTIZE, backend: str = DEFAULT_BACKEND,
+                 torch_threads: Optional[int] = DEFAULT_TORCH_THREADS,
+                 interop_threads: Optional[int] = DEFAULT_INTEROP_THREADS):
+        """Set up the summarizer; models are loaded from the shared registry on first use
+        
+        quantize applies int8 dynamic quantization to the Linear layers of
+        both models on CPU. backend='onnx' runs summarization on ONNX
+        Runtime (CPU, needs optimum). torch_threads and interop_threads set
+        torch's thread pools for the process.
+        """
+        self.model_name = model_name
+        self.whisper_model_name = whisper_model_name
+        self.chunk_overlap_tokens = chunk_overlap_tokens
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.summarizer = pipeline(
+        self.quantize = quantize and self.device == "cpu"
+        self.backend = backend if self.device == "cpu" else "torch"
+        if self.backend == "onnx" and not onnx_available():
+            # Resolved here so registry and cache keys name the backend actually used
+            print("ONNX backend needs optimum. Install with: pip install optimum[onnxruntime]")
+            print("Falling back to the PyTorch summarizer")
+            self.backend = "torch"
+        configure_threads(torch_threads, interop_threads)
+        self.registry = registry or get_registry()
+        if summary_cache is None and use_cache:
+            summary_cache = SummaryCache()
+        self.summary_cache = summary_cache
+        if media_store is None and use_cache:
+            media_store = MediaStore()
+        self.media_store = media_store
+        # Extra keyword arguments for Whisper's transcribe (language, temperature, ...)
+        self.transcribe_options = transcribe_options or {}
+        self.transcribe_workers = transcribe_workers
+        self.segment_seconds = segment_seconds
+        # Transcribe only the speech regions found by an energy detector
+        self.skip_silence = skip_silence
+        self._models = {}
+        self._models_lock = threading.RLock()
+    
+    @property
+    def summarizer(self):
+        """The summarization pipeline, shared with every other instance using the same model"""
+        key = ('summarization', self.model_name, self.device, self.backend, self.quantize)
+        return self._model(key, self._load_summarizer)
+    
+    @property
+    def whisper_model(self):
+        """The Whisper model, loaded only when a video is actually transcribed"""
+        return self._model(('whisper', self.whisper_model_name, self.device, self.quantize), self._load_whisper)
+    
+    @property
+    def segmented_transcriber(self) -> SegmentedTranscriber:
+        """Process pool transcribing long audio in parallel segments (CPU only)"""
+        key = ('whisper-pool', self.whisper_model_name, self.transcribe_workers, self.segment_seconds,
+               self.quantize)
+        return self._model(key, self._load_segmented_transcriber)
+    
+    @property
+    def chunker(self) -> TokenChunker:
+        """Sentence chunker sized to the summarizer's tokenizer, with a shared token-count cache"""
+        return self._model(('chunker', self.model_name, self.chunk_overlap_tokens), self._load_chunker)
+    
+    def _model(self, key, loader):
+        with self._models_lock:
+            if key not in self._models:
+                self._models[key] = self.registry.acquire(key, loader)
+            return self._models[key]
+    
+    def _load_summarizer(self):
+        if self.backend == "onnx":
+            return load_onnx_summarizer(self.model_name)
+        
+        summarizer = pipeline(
             "summarization",
-            model=model_name,
-            tokenizer=model_name,
+            model=self.model_name,
+            tokenizer=self.model_name,
             device=0 if self.device == "cuda" else -1
         )
-        
-        # Initialize Whisper for transcription
-        self.whisper_model = whisper.load_model("base")
+        if self.quantize:
+            summarizer.model = quantize_linear(summarizer.model)
+        return summarizer
+    
+    def _load_chunker(self):
+        return TokenChunker(self.summarizer.tokenizer, overlap_tokens=self.chunk_overlap_tokens)
+    
+    def _load_segmented_transcriber(self):
+        return SegmentedTranscriber(self.whisper_model_name, workers=self.transcribe_workers,
+                                    segment_seconds=self.segment_seconds, quantize=self.quantize)
+    
+    def _load_whisper(self):
+        model = whisper.load_model(self.whisper_model_name, device=self.device)
+        return quantize_whisper(model) if self.quantize else model
+    
+    def close(self):
+        """Release this instance's models back to the registry"""
+        with self._models_lock:
+            keys, self._models = list(self._models), {}
+        for key in keys:
+            self.registry.release(key)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
         
     def transcribe_audio(self, video_path: str) -> str:
         """Extract and transcribe audio from video"""
+        return self.transcribe_audio_segments(video_path)['text']
+    
+    def transcribe_audio_segments(self, video_path: str) -> Dict:
+        """Transcribe audio from video; returns the text and its timestamped segments"""
         try:
-            # Extract audio using ffmpeg
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
-                (
-                    ffmpeg
-                    .input(video_path)
-                    .output(temp_audio.name, acodec='pcm_s16le', ac=1, ar='16000')
-                    .overwrite_output()
-                    .run(capture_stdout=True, capture_stderr=True)
-                )
-                
-                # Transcribe using Whisper
-                result = self.whisper_model.transcribe(temp_audio.name)
-                os.unlink(temp_audio.name)
-                
-                return result['text']
+            # Decode straight into memory and hand the samples to Whisper
+            audio = decode_audio(video_path)
+            return self._transcribe_samples(audio)
+        except ffmpeg.Error as e:
+            print(f"Error decoding audio: {e.stderr.decode(errors='replace') if e.stderr else e}")
         except Exception as e:
             print(f"Error transcribing audio: {e}")
-            return ""
+        return {'text': "", 'segments': []}
+    
+    def _transcribe_samples(self, audio) -> Dict:
+        """Transcribe 16 kHz samples, skipping silence if enabled
+        
+        With skip_silence, only the detected speech regions are joined and
+        transcribed, and segment timestamps are mapped back onto the
+        original timeline. If the detector keeps almost nothing, the whole
+        audio is transcribed instead.
+        """
+        if not self.skip_silence:
+            return self._transcribe_speech(audio)
+        
+        regions = speech_regions(audio)
+        kept = sum(end - start for start, end in regions)
+        if kept < MIN_SPEECH_FRACTION * len(audio):
+            print(f"Speech detector kept {kept / max(len(audio), 1):.1%} of the audio; transcribing all of it")
+            return self._transcribe_speech(audio)
+        
+        result = self._transcribe_speech(np.concatenate([audio[start:end] for start, end in regions]))
+        to_original = timeline_mapper(regions)
+        for segment in result['segments']:
+            segment['start'] = round(to_original(segment['start']), 3)
+            segment['end'] = round(to_original(segment['end'], is_end=True), 3)
+        return result
+    
+    def _transcribe_speech(self, audio) -> Dict:
+        """Transcribe 16 kHz samples, splitting long audio across worker processes"""
+        if (self.transcribe_workers > 1 and self.device == "cpu"
+                and len(audio) > self.segment_seconds * SAMPLE_RATE):
+            return self.segmented_transcriber.transcribe(audio, self.transcribe_options)
+        result = self.whisper_model.transcribe(audio, **self.transcribe_options)
+        return stitch_segments([result], [0.0])
     
     def download_video_audio(self, video_url: str, output_path: str) -> str:
-        """Download video from YouTube (requires yt-dlp)"""
+        """Download a video's audio stream (requires yt-dlp); returns the file's path
+        
+        The stream is saved in its original container (m4a, webm, ...) rather
+        than converted to WAV, so it is decoded only once, at transcription.
+        output_path's extension is replaced by the stream's.
+        """
         try:
             import yt_dlp
             
             ydl_opts = {
                 'format': 'bestaudio/best',
-                'outtmpl': output_path,
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'wav',
-                    'preferredquality': '192',
-                }],
+                'outtmpl': os.path.splitext(output_path)[0] + '.%(ext)s',
+                'quiet': True,
             }
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
-            
-            return output_path.replace('.mp3', '.wav')
+                info = ydl.extract_info(video_url, download=True)
+                return ydl.prepare_filename(info)
         except ImportError:
             print("yt-dlp not installed. Install with: pip install yt-dlp")
             return ""
@@ -71,53 +227,200 @@ class VideoSummarizer:
             print(f"Error downloading video: {e}")
             return ""
     
-    def summarize_text(self, text: str, max_length: int = 150, min_length: int = 50) -> str:
+    def summarize_text(self, text: str, max_length: int = 150, min_length: int = 50,
+                       hierarchical: bool = False) -> str:
         """Summarize text using the ML model"""
+        return self.summarize_texts([text], max_length, min_length, hierarchical=hierarchical)[0]
+    
+    def summarize_texts(self, texts: List[str], max_length: int = 150, min_length: int = 50,
+                        batch_size: int = DEFAULT_BATCH_SIZE, hierarchical: bool = False) -> List[str]:
+        """Summarize many texts at once, batching their chunks through the model
+        
+        With hierarchical, long texts are reduced by map-reduce passes
+        (see _summarize_hierarchical) instead of joining one short summary
+        per chunk. Summaries are looked up in and saved to the summary
+        cache, so a text seen before with the same settings is not
+        summarized again.
+        """
+        summaries = list(texts)
+        keys = {}
+        for i, text in enumerate(texts):
+            if len(text) >= 50:
+                keys[i] = self._cache_key(text, {
+                    'max_length': max_length,
+                    'min_length': min_length,
+                    'hierarchical': hierarchical,
+                    'chunk_overlap_tokens': self.chunk_overlap_tokens
+                })
+        
+        found = self.summary_cache.get_many(list(set(keys.values()))) if self.summary_cache and keys else {}
+        missing = [i for i, key in keys.items() if key not in found]
+        for i, key in keys.items():
+            if key in found:
+                summaries[i] = found[key]
+        if not missing:
+            return summaries
+        
         try:
+            if hierarchical:
+                outputs = self._summarize_hierarchical([texts[i] for i in missing], max_length, min_length,
+                                                       batch_size)
+            else:
+                outputs = self._summarize_chunks([texts[i] for i in missing], max_length, min_length,
+                                                 batch_size)
+        except Exception as e:
+            print(f"Error summarizing text: {e}")
+            for i in missing:
+                text = texts[i]
+                summaries[i] = text[:max_length] + "..." if len(text) > max_length else text
+            return summaries
+        
+        for i, output in zip(missing, outputs):
+            summaries[i] = output
+        if self.summary_cache is not None:
+            self.summary_cache.put_many({keys[i]: output for i, output in zip(missing, outputs)})
+        return summaries
+    
+    def _summarize_chunks(self, texts: List[str], max_length: int, min_length: int,
+                          batch_size: int) -> List[str]:
+        """One summary per chunk, with max_length shared between a text's chunks"""
+        pieces = {}
+        jobs = []
+        owners = []
+        for i, text in enumerate(texts):
             if len(text) < 50:
-                return text
+                continue
             
-            # Split long texts into chunks
-            max_chunk_size = 1024
-            if len(text) > max_chunk_size:
-                chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-                summaries = []
-                
-                for chunk in chunks:
-                    summary = self.summarizer(
-                        chunk,
-                        max_length=max_length // len(chunks) + 20,
-                        min_length=min_length // len(chunks) + 10,
-                        do_sample=False
-                    )
-                    summaries.append(summary[0]['summary_text'])
-                
-                return " ".join(summaries)
+            chunks = self._chunk_text(text)
+            if len(chunks) > 1:
+                chunk_max = max_length // len(chunks) + 20
+                chunk_min = min_length // len(chunks) + 10
             else:
-                summary = self.summarizer(
-                    text,
+                chunk_max, chunk_min = max_length, min_length
+            for chunk in chunks:
+                jobs.append((chunk, chunk_max, chunk_min))
+                owners.append(i)
+            pieces[i] = []
+        
+        if not jobs:
+            return list(texts)
+        
+        outputs = self._generate_cached(jobs, batch_size)
+        
+        # Chunks were queued in order, so each text's pieces come back in order
+        for i, output in zip(owners, outputs):
+            pieces[i].append(output)
+        return [" ".join(pieces[i]) if i in pieces else text for i, text in enumerate(texts)]
+    
+    def _summarize_hierarchical(self, texts: List[str], max_length: int, min_length: int,
+                                batch_size: int) -> List[str]:
+        """Map-reduce summarization whose cost and output stay bounded for long texts.
+        
+        Each pass summarizes every chunk of every text that does not yet
+        fit one model window (the map, batched across all texts) and
+        concatenates the partial summaries for the next pass (the reduce).
+        Once a text fits, it gets one final summary of max_length. Partial
+        summaries are stored in the summary cache, so re-summarizing the
+        same transcript, even with different final lengths, reruns only
+        the last pass.
+        """
+        pending = {i: text for i, text in enumerate(texts) if len(text) >= 50}
+        for _ in range(MAX_REDUCE_PASSES):
+            jobs = []
+            owners = []
+            for i, text in pending.items():
+                chunks = self._chunk_text(text)
+                if len(chunks) > 1:
+                    jobs.extend((chunk, MAP_MAX_LENGTH, MAP_MIN_LENGTH) for chunk in chunks)
+                    owners.extend([i] * len(chunks))
+            if not jobs:
+                break
+            
+            partials = {i: [] for i in owners}
+            for i, output in zip(owners, self._generate_cached(jobs, batch_size)):
+                partials[i].append(output)
+            for i, parts in partials.items():
+                pending[i] = " ".join(parts)
+        
+        order = list(pending)
+        outputs = self._generate_cached([(pending[i], max_length, min_length) for i in order], batch_size)
+        summaries = list(texts)
+        for i, output in zip(order, outputs):
+            summaries[i] = output
+        return summaries
+    
+    def _generate_cached(self, jobs: List[tuple], batch_size: int) -> List[str]:
+        """_generate, reusing stored summaries for jobs seen before"""
+        if self.summary_cache is None:
+            return self._generate(jobs, batch_size)
+        
+        keys = [self._cache_key(text, {'max_length': max_length, 'min_length': min_length})
+                for text, max_length, min_length in jobs]
+        found = self.summary_cache.get_many(list(set(keys)))
+        
+        missing = {}
+        for index, key in enumerate(keys):
+            if key not in found:
+                missing.setdefault(key, index)
+        if missing:
+            outputs = self._generate([jobs[index] for index in missing.values()], batch_size)
+            generated = dict(zip(missing, outputs))
+            self.summary_cache.put_many(generated)
+            found.update(generated)
+        return [found[key] for key in keys]
+    
+    def _cache_key(self, text: str, params: Dict) -> str:
+        params = dict(params, do_sample=False, quantize=self.quantize, backend=self.backend)
+        return SummaryCache.make_key(text, self.model_name, params)
+    
+    def _chunk_text(self, text: str) -> List[str]:
+        """Split text into whole-sentence pieces that fill the model's token window"""
+        return self.chunker.chunk(text) or [text]
+    
+    def _generate(self, jobs: List[tuple], batch_size: int) -> List[str]:
+        """Run (text, max_length, min_length) jobs through the model in length-sorted batches.
+        
+        Jobs sharing generation settings are sorted by length so every batch
+        holds similarly sized inputs and little compute is spent on padding.
+        Results are returned in the order of jobs.
+        """
+        outputs = [None] * len(jobs)
+        groups = {}
+        for index, (text, max_length, min_length) in enumerate(jobs):
+            groups.setdefault((max_length, min_length), []).append(index)
+        
+        for (max_length, min_length), indices in groups.items():
+            indices.sort(key=lambda index: self.chunker.count_tokens(jobs[index][0]), reverse=True)
+            for start in range(0, len(indices), batch_size):
+                bucket = indices[start:start + batch_size]
+                results = self.summarizer(
+                    [jobs[index][0] for index in bucket],
                     max_length=max_length,
                     min_length=min_length,
-                    do_sample=False
+                    do_sample=False,
+                    truncation=True,
+                    batch_size=len(bucket)
                 )
-                return summary[0]['summary_text']
-        except Exception as e:
-            print(f"Error summarizing text: {e}")
-            return text[:max_length] + "..." if len(text) > max_length else text
+                for index, result in zip(bucket, results):
+                    outputs[index] = result['summary_text']
+        return outputs
     
-    def summarize_video_metadata(self, video_data: Dict) -> Dict:
-        """Summarize video based on metadata (title, description, comments)"""
+    def _metadata_text(self, video_data: Dict, max_comments: int = 5, transcription: str = "") -> str:
+        """Title, description, transcription and top comments as one text"""
         combined_text = f"Title: {video_data.get('title', '')}\n\n"
         combined_text += f"Description: {video_data.get('description', '')}\n\n"
         
+        if transcription:
+            combined_text += f"Transcription: {transcription}\n\n"
+        
         # Add top comments if available
         if 'comments' in video_data and video_data['comments']:
             combined_text += "Top Comments:\n"
-            for comment in video_data['comments'][:5]:  # Top 5 comments
+            for comment in video_data['comments'][:max_comments]:
                 combined_text += f"- {comment.get('text', '')}\n"
-        
-        summary = self.summarize_text(combined_text)
-        
+        return combined_text
+    
+    def _summary_record(self, video_data: Dict, summary: str) -> Dict:
         return {
             'video_id': video_data.get('video_id'),
             'title': video_data.get('title'),
@@ -126,33 +429,62 @@ class VideoSummarizer:
             'engagement_score': self._calculate_engagement_score(video_data)
         }
     
+    def summarize_video_metadata(self, video_data: Dict) -> Dict:
+        """Summarize video based on metadata (title, description, comments)"""
+        summary = self.summarize_text(self._metadata_text(video_data))
+        return self._summary_record(video_data, summary)
+    
     def summarize_video_content(self, video_url: str, video_data: Dict) -> Dict:
         """Summarize video content including audio transcription"""
-        # Download and transcribe
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            audio_path = self.download_video_audio(video_url, temp_file.name)
-            
+        transcription = self._transcribe_url(video_url, video_data.get('video_id'))
+        combined_text = self._metadata_text(video_data, max_comments=10, transcription=transcription)
+        summary = self.summarize_text(combined_text, max_length=200, min_length=80, hierarchical=True)
+        return self._content_record(video_data, summary, transcription)
+    
+    def _transcribe_url(self, video_url: str, video_id: Optional[str] = None) -> str:
+        """Download a video's audio and transcribe it, reusing stored audio and transcripts"""
+        if self.media_store is not None:
+            return self._transcribe_stored(video_url, video_id or video_url)
+        
+        download_dir = tempfile.mkdtemp()
+        try:
+            audio_path = self.download_video_audio(video_url, os.path.join(download_dir, "audio"))
             if audio_path and os.path.exists(audio_path):
-                transcription = self.transcribe_audio(audio_path)
-                os.unlink(audio_path)
-            else:
-                transcription = ""
+                return self.transcribe_audio(audio_path)
+            return ""
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
+    
+    def _transcribe_stored(self, video_url: str, video_id: str) -> str:
+        store = self.media_store
+        transcription = store.get_transcript(video_id, self.whisper_model_name, self._transcript_options())
+        if transcription is not None:
+            return transcription
         
-        # Combine transcription with metadata
-        combined_text = f"Title: {video_data.get('title', '')}\n\n"
-        combined_text += f"Description: {video_data.get('description', '')}\n\n"
+        audio_path = store.get_audio(video_id)
+        if audio_path is None:
+            download_dir = tempfile.mkdtemp(dir=store.temp_dir())
+            try:
+                downloaded = self.download_video_audio(video_url, os.path.join(download_dir, "audio"))
+                if downloaded and os.path.exists(downloaded):
+                    audio_path = store.put_audio(video_id, downloaded)
+            finally:
+                shutil.rmtree(download_dir, ignore_errors=True)
+        if audio_path is None:
+            return ""
         
+        transcription = self.transcribe_audio(audio_path)
         if transcription:
-            combined_text += f"Transcription: {transcription}\n\n"
-        
-        # Add comments if available
-        if 'comments' in video_data and video_data['comments']:
-            combined_text += "Top Comments:\n"
-            for comment in video_data['comments'][:10]:
-                combined_text += f"- {comment.get('text', '')}\n"
-        
-        summary = self.summarize_text(combined_text, max_length=200, min_length=80)
-        
+            store.put_transcript(video_id, self.whisper_model_name, transcription,
+                                 self._transcript_options())
+        return transcription
+    
+    def _transcript_options(self) -> Dict:
+        """Everything besides the model that changes a transcript, for the media store key"""
+        # backend only changes the summarizer, so switching it keeps stored transcripts
+        return dict(self.transcribe_options, skip_silence=self.skip_silence, quantize=self.quantize)
+    
+    def _content_record(self, video_data: Dict, summary: str, transcription: str) -> Dict:
         return {
             'video_id': video_data.get('video_id'),
             'title': video_data.get('title'),
@@ -175,16 +507,32 @@ class VideoSummarizer:
         engagement_rate = ((likes + comments) / views) * 100
         return round(engagement_rate, 2)
     
-    def batch_summarize_videos(self, videos: List[Dict], use_transcription: bool = False) -> List[Dict]:
-        """Summarize multiple videos"""
-        summaries = []
+    def batch_summarize_videos(self, videos: List[Dict], use_transcription: bool = False,
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict]:
+        """Summarize multiple videos, batching model inference across all of them"""
+        summaries = [None] * len(videos)
+        metadata_only = []
+        with_transcription = []
         
-        for video in videos:
+        for i, video in enumerate(videos):
             if use_transcription and 'url' in video:
-                summary = self.summarize_video_content(video['url'], video)
+                with_transcription.append(i)
             else:
-                summary = self.summarize_video_metadata(video)
-            
-            summaries.append(summary)
+                metadata_only.append(i)
+        
+        texts = self.summarize_texts([self._metadata_text(videos[i]) for i in metadata_only],
+                                     batch_size=batch_size)
+        for i, summary in zip(metadata_only, texts):
+            summaries[i] = self._summary_record(videos[i], summary)
+        
+        transcriptions = [self._transcribe_url(videos[i]['url'], videos[i].get('video_id'))
+                          for i in with_transcription]
+        texts = self.summarize_texts(
+            [self._metadata_text(videos[i], max_comments=10, transcription=transcription)
+             for i, transcription in zip(with_transcription, transcriptions)],
+            max_length=200, min_length=80, batch_size=batch_size, hierarchical=True
+        )
+        for i, transcription, summary in zip(with_transcription, transcriptions, texts):
+            summaries[i] = self._content_record(videos[i], summary, transcription)
         
         return summaries
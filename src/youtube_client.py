@@ -0,0 +1,48 @@
+import json
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+import httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+
+# Socket timeout for pooled connections, in seconds
+HTTP_TIMEOUT = 60
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def discovery_document() -> Optional[Dict]:
+    """The bundled YouTube v3 discovery document, parsed once per process"""
+    document = discovery_cache.get_static_doc('youtube', 'v3')
+    return json.loads(document) if document else None
+
+
+def build_client(api_key: str, http=None, api_endpoint: Optional[str] = None):
+    """Build a YouTube service object from the cached discovery document"""
+    client_options = {'api_endpoint': api_endpoint} if api_endpoint else None
+    document = discovery_document()
+    if document is None:
+        return build('youtube', 'v3', developerKey=api_key, http=http, client_options=client_options)
+    return build_from_document(document, developerKey=api_key, http=http, client_options=client_options)
+
+
+def get_client(api_key: str, api_endpoint: Optional[str] = None):
+    """Return the calling thread's YouTube client for this key and endpoint.
+
+    Clients are built once per thread and reused, each with its own
+    keep-alive httplib2 connection pool (httplib2.Http is not thread-safe,
+    so connections are never shared between threads).
+    """
+    clients = getattr(_local, 'clients', None)
+    if clients is None:
+        clients = _local.clients = {}
+
+    key = (api_key, api_endpoint)
+    client = clients.get(key)
+    if client is None:
+        client = build_client(api_key, http=httplib2.Http(timeout=HTTP_TIMEOUT), api_endpoint=api_endpoint)
+        clients[key] = client
+    return client
@@ -1,148 +1,636 @@
 import os
-import json
 import time
-from datetime import datetime, timedelta
-from googleapiclient.discovery import build
+import itertools
+import threading
+import weakref
+from datetime import datetime, timedelta, timezone
 from googleapiclient.errors import HttpError
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional, Union
+
+from response_cache import ResponseCache
+from quota_manager import QuotaManager, QuotaExceededError
+from state_store import StateStore
+from youtube_client import build_client, get_client
+
+if TYPE_CHECKING:
+    from snapshot_store import SnapshotStore
+
+# videos.list accepts at most 50 comma-separated IDs per request
+MAX_IDS_PER_REQUEST = 50
+# Page size limit shared by the list endpoints
+MAX_RESULTS_PER_PAGE = 50
+# commentThreads.list and comments.list allow up to 100 per page
+MAX_COMMENTS_PER_PAGE = 100
+# Incremental channel checks re-read uploads published this long before the
+# watermark, and start with a small page since most polls find nothing new
+WATERMARK_OVERLAP_MINUTES = 60
+INCREMENTAL_PAGE_SIZE = 10
+# Relative search windows ("last N hours") are aligned to this many minutes
+# so repeated searches produce identical, cacheable requests
+SEARCH_WINDOW_ALIGN_MINUTES = 15
+
+_COMMENT_FIELDS = 'authorDisplayName,textDisplay,likeCount,publishedAt'
+
+# Partial-response masks (the fields= parameter) listing exactly what each
+# method reads, so the API skips everything else (other thumbnail sizes,
+# localizations, channel titles, ...). etag is kept for cache revalidation.
+# Override entries via YouTubeMonitor(field_masks=...); '' requests the
+# full resource.
+FIELD_MASKS = {
+    'channel_videos': 'etag,nextPageToken,'
+                      'items(id/videoId,snippet(title,description,publishedAt,thumbnails/high/url))',
+    'uploads_playlist': 'etag,items(contentDetails/relatedPlaylists/uploads)',
+    'channel_uploads': 'etag,nextPageToken,'
+                       'items(snippet(title,description,publishedAt,thumbnails(high/url,default/url)),'
+                       'contentDetails(videoId,videoPublishedAt))',
+    'video_details': 'etag,items(id,snippet(title,description,publishedAt,tags),'
+                     'contentDetails/duration,statistics(viewCount,likeCount,commentCount))',
+    'comments': 'etag,nextPageToken,'
+                f'items(snippet(totalReplyCount,topLevelComment(id,snippet({_COMMENT_FIELDS}))),'
+                f'replies/comments(id,snippet(parentId,{_COMMENT_FIELDS})))',
+    'comment_replies': f'etag,nextPageToken,items(id,snippet(parentId,{_COMMENT_FIELDS}))',
+    'search': 'etag,nextPageToken,'
+              'items(id/videoId,snippet(title,description,publishedAt,thumbnails/high/url))',
+    'trending': 'etag,nextPageToken,'
+                'items(id,snippet(title,description,publishedAt,tags),statistics(viewCount,likeCount,commentCount))',
+}
+
+
+_shared_lock = threading.Lock()
+_shared_instances = {}
+# Stores of caller-supplied transports, dropped together with the transport
+_transport_instances = weakref.WeakKeyDictionary()
+
+
+def _shared(factory, api_endpoint: Optional[str] = None, http=None):
+    """Process-wide default instance of a thread-safe store (cache, quota, state)
+
+    With an http transport or a stand-in api_endpoint, the instance is an
+    in-memory store shared only by monitors using that transport (for as
+    long as it lives) or endpoint, so offline traffic never reaches the
+    on-disk cache, quota and state of real runs.
+    """
+    key = (factory, api_endpoint)
+    with _shared_lock:
+        instances = _shared_instances if http is None else _transport_instances.setdefault(http, {})
+        if key not in instances:
+            offline = http is not None or api_endpoint is not None
+            instances[key] = factory(':memory:') if offline else factory()
+        return instances[key]
+
+
+def _aligned_now() -> datetime:
+    """Current UTC time rounded down to SEARCH_WINDOW_ALIGN_MINUTES"""
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    return now - timedelta(minutes=now.minute % SEARCH_WINDOW_ALIGN_MINUTES)
+
+
+def _format_timestamp(value: Optional[Union[str, datetime]]) -> Optional[str]:
+    """Format a datetime as the RFC 3339 string the API expects"""
+    if value is None or isinstance(value, str):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_timestamp(value: Union[str, datetime]) -> datetime:
+    """Parse an RFC 3339 timestamp as returned by the API"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 
 class YouTubeMonitor:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None, use_cache: bool = True,
+                 quota: Optional[QuotaManager] = None, state_store: Optional[StateStore] = None,
+                 http=None, api_endpoint: Optional[str] = None,
+                 field_masks: Optional[Dict[str, str]] = None,
+                 snapshot_store: Optional['SnapshotStore'] = None):
+        """http replaces the HTTP transport (e.g. api_replay.ReplayHttp) and
+        api_endpoint the API root URL (e.g. an api_replay.StandInServer).
+        field_masks overrides entries of FIELD_MASKS for callers that need
+        more of each resource. With a snapshot_store, trending statistics
+        are recorded on every fetch.
+        
+        Construction is cheap: the API client comes from a process-wide,
+        per-thread pool and the default cache, quota manager and state
+        store are shared by every monitor in the process. With http or
+        api_endpoint, the defaults are instead in-memory stores shared by
+        monitors using the same transport or endpoint, and cache keys
+        include the endpoint, so stand-in responses and quota use are kept
+        apart from the real API's."""
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self.api_endpoint = api_endpoint
+        # A caller-supplied transport is owned by this monitor alone
+        self._client = build_client(api_key, http=http, api_endpoint=api_endpoint) if http is not None else None
+        self.cache = cache if cache is not None or not use_cache else _shared(ResponseCache, api_endpoint, http)
+        self.quota = quota or _shared(QuotaManager, api_endpoint, http)
+        self.state_store = state_store or _shared(StateStore, api_endpoint, http)
+        self.field_masks = dict(FIELD_MASKS, **(field_masks or {}))
+        self.snapshot_store = snapshot_store
+        self._uploads_playlists = {}
+    
+    @property
+    def youtube(self):
+        """The API client for the calling thread"""
+        return self._client or get_client(self.api_key, self.api_endpoint)
+    
+    def _execute(self, endpoint: str, revalidate: bool = False, **params) -> Dict:
+        """Run an API call such as 'videos.list', going through the response cache.
+        
+        Fresh cache hits skip the network; stale entries (or any entry, with
+        revalidate=True) are revalidated with If-None-Match so an unchanged
+        resource costs a bodiless 304.
+        Every network call is charged to the quota manager first, which
+        raises QuotaExceededError instead of letting the API reject it.
+        """
+        params = {k: v for k, v in params.items() if v is not None}
+        if not params.get('fields'):
+            params.pop('fields', None)
+        # Responses from another API root must never answer for the real API
+        cache_params = dict(params, api_endpoint=self.api_endpoint) if self.api_endpoint else params
+        cached = self.cache.get(endpoint, cache_params) if self.cache else None
+        if cached and cached.fresh and not revalidate:
+            return cached.body
+        
+        self.quota.acquire(endpoint)
+        resource, method = endpoint.split('.')
+        request = getattr(getattr(self.youtube, resource)(), method)(**params)
+        if cached and cached.etag:
+            request.headers['If-None-Match'] = cached.etag
+        
+        try:
+            response = request.execute()
+        except HttpError as e:
+            if cached and e.resp.status == 304:
+                self.cache.refresh(endpoint, cache_params)
+                return cached.body
+            if e.resp.status == 403 and b'quotaExceeded' in (e.content or b''):
+                self.quota.mark_exhausted()
+                raise QuotaExceededError(f"YouTube API reported the daily quota as exceeded ({endpoint})") from e
+            raise
+        
+        if self.cache:
+            self.cache.put(endpoint, cache_params, response)
+        return response
+        
+    def get_channel_videos(self, channel_id: str, max_results: int = 50,
+                           use_uploads_playlist: bool = False) -> List[Dict]:
+        """Get recent videos from a channel
+        
+        With use_uploads_playlist=True the channel is enumerated through its
+        uploads playlist (1 quota unit per page, fully paginated) instead of
+        search.list (100 units, capped at 50 results).
+        """
+        if use_uploads_playlist:
+            return list(self.iter_channel_uploads(channel_id, max_videos=max_results))
         
-    def get_channel_videos(self, channel_id: str, max_results: int = 50) -> List[Dict]:
-        """Get recent videos from a channel"""
         try:
-            response = self.youtube.search().list(
+            response = self._execute(
+                'search.list',
                 part='id,snippet',
+                fields=self.field_masks['channel_videos'],
                 channelId=channel_id,
                 maxResults=max_results,
                 order='date',
                 type='video'
-            ).execute()
-            
-            videos = []
-            for item in response['items']:
-                video_data = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails']['high']['url']
-                }
-                videos.append(video_data)
+            )
             
-            return videos
+            return [self._parse_search_item(item) for item in response['items']]
         except HttpError as e:
             print(f"Error fetching videos: {e}")
             return []
     
-    def get_video_details(self, video_id: str) -> Dict:
-        """Get detailed information about a specific video"""
+    def _parse_search_item(self, item: Dict) -> Dict:
+        """Convert a search.list result into the video dict used by callers"""
+        return {
+            'video_id': item['id']['videoId'],
+            'title': item['snippet']['title'],
+            'description': item['snippet']['description'],
+            'published_at': item['snippet']['publishedAt'],
+            'thumbnail_url': item['snippet'].get('thumbnails', {}).get('high', {}).get('url', '')
+        }
+    
+    def remaining_quota(self) -> int:
+        """Quota units left today, shared across processes"""
+        return self.quota.remaining()
+    
+    def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """Resolve (and remember) the uploads playlist of a channel"""
+        if channel_id in self._uploads_playlists:
+            return self._uploads_playlists[channel_id]
+        
         try:
-            response = self.youtube.videos().list(
-                part='statistics,contentDetails,snippet',
-                id=video_id
-            ).execute()
+            response = self._execute(
+                'channels.list',
+                part='contentDetails',
+                fields=self.field_masks['uploads_playlist'],
+                id=channel_id
+            )
+        except HttpError as e:
+            print(f"Error resolving uploads playlist: {e}")
+            return None
+        
+        if not response.get('items'):
+            return None
+        
+        playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        self._uploads_playlists[channel_id] = playlist_id
+        return playlist_id
+    
+    def iter_channel_uploads(self, channel_id: str, max_videos: Optional[int] = None,
+                             published_after: Optional[Union[str, datetime]] = None,
+                             page_size: int = MAX_RESULTS_PER_PAGE,
+                             revalidate: bool = False) -> Iterator[Dict]:
+        """Lazily yield a channel's uploads, newest first, page by page.
+        
+        Stops after max_videos items, or at the first video published before
+        published_after (an RFC 3339 string or a timezone-aware datetime).
+        Pages are only requested as the caller consumes the generator.
+        Pass revalidate=True to confirm cached pages with the API (cheap 304s)
+        instead of trusting them until their TTL expires.
+        """
+        if max_videos is not None and max_videos <= 0:
+            return
+        playlist_id = self.get_uploads_playlist_id(channel_id)
+        if not playlist_id:
+            return
+        
+        cutoff = _parse_timestamp(published_after) if published_after else None
+        yielded = 0
+        page_token = None
+        
+        while True:
+            request_size = min(page_size, MAX_RESULTS_PER_PAGE)
+            if max_videos is not None:
+                request_size = min(request_size, max_videos - yielded)
             
-            if not response['items']:
-                return {}
+            try:
+                response = self._execute(
+                    'playlistItems.list',
+                    revalidate=revalidate,
+                    part='snippet,contentDetails',
+                    fields=self.field_masks['channel_uploads'],
+                    playlistId=playlist_id,
+                    maxResults=request_size,
+                    pageToken=page_token
+                )
+            except HttpError as e:
+                print(f"Error fetching uploads: {e}")
+                return
             
-            video = response['items'][0]
-            return {
-                'video_id': video['id'],
-                'title': video['snippet']['title'],
-                'description': video['snippet']['description'],
-                'published_at': video['snippet']['publishedAt'],
-                'duration': video['contentDetails']['duration'],
-                'view_count': int(video['statistics'].get('viewCount', 0)),
-                'like_count': int(video['statistics'].get('likeCount', 0)),
-                'comment_count': int(video['statistics'].get('commentCount', 0)),
-                'tags': video['snippet'].get('tags', [])
-            }
-        except HttpError as e:
-            print(f"Error fetching video details: {e}")
-            return {}
+            for item in response.get('items', []):
+                video = self._parse_playlist_item(item)
+                if cutoff and _parse_timestamp(video['published_at']) < cutoff:
+                    return
+                
+                yield video
+                yielded += 1
+                if max_videos is not None and yielded >= max_videos:
+                    return
+            
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def _parse_playlist_item(self, item: Dict) -> Dict:
+        """Convert a playlistItems.list item into the channel video dict"""
+        snippet = item['snippet']
+        thumbnails = snippet.get('thumbnails', {})
+        thumbnail = thumbnails.get('high') or thumbnails.get('default') or {}
+        return {
+            'video_id': item['contentDetails']['videoId'],
+            'title': snippet['title'],
+            'description': snippet['description'],
+            # videoPublishedAt is the real publish time; snippet.publishedAt
+            # is when the item was added to the playlist
+            'published_at': item['contentDetails'].get('videoPublishedAt', snippet['publishedAt']),
+            'thumbnail_url': thumbnail.get('url', '')
+        }
+    
+    def get_video_details(self, video_id: str) -> Dict:
+        """Get detailed information about a specific video"""
+        return self.get_videos_details([video_id]).get(video_id, {})
+    
+    def get_videos_details(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Get detailed information for many videos, keyed by video ID.
+        
+        IDs are packed into batches of up to 50 per videos.list request
+        (the API maximum), so N videos cost ceil(N / 50) quota units.
+        """
+        unique_ids = list(dict.fromkeys(v for v in video_ids if v))
+        details = {}
+        
+        for start in range(0, len(unique_ids), MAX_IDS_PER_REQUEST):
+            batch = unique_ids[start:start + MAX_IDS_PER_REQUEST]
+            try:
+                response = self._execute(
+                    'videos.list',
+                    part='statistics,contentDetails,snippet',
+                    fields=self.field_masks['video_details'],
+                    id=','.join(batch)
+                )
+            except HttpError as e:
+                print(f"Error fetching video details: {e}")
+                continue
+            
+            for video in response.get('items', []):
+                details[video['id']] = self._parse_video_details(video)
+        
+        return details
+    
+    def _parse_video_details(self, video: Dict) -> Dict:
+        """Convert a videos.list item into the details dict used by callers"""
+        return {
+            'video_id': video['id'],
+            'title': video['snippet']['title'],
+            'description': video['snippet']['description'],
+            'published_at': video['snippet']['publishedAt'],
+            'duration': video['contentDetails']['duration'],
+            'view_count': int(video['statistics'].get('viewCount', 0)),
+            'like_count': int(video['statistics'].get('likeCount', 0)),
+            'comment_count': int(video['statistics'].get('commentCount', 0)),
+            'tags': video['snippet'].get('tags', [])
+        }
     
     def get_video_comments(self, video_id: str, max_comments: int = 100) -> List[Dict]:
         """Get comments from a video"""
-        try:
-            response = self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=max_comments,
-                order='relevance'
-            ).execute()
+        return list(self.iter_video_comments(video_id, max_comments=max_comments))
+    
+    def iter_video_comments(self, video_id: str, max_comments: Optional[int] = None,
+                            include_replies: bool = False, order: str = 'relevance') -> Iterator[Dict]:
+        """Stream a video's comments, following nextPageToken lazily.
+        
+        Only one page (at most 100 threads) is held at a time, so callers can
+        walk videos with 100k+ comments or stop early without fetching the
+        rest. With include_replies, each thread's replies follow it, paging
+        through comments.list when the thread embeds only some of them.
+        max_comments counts replies as well as top-level comments.
+        """
+        if max_comments is not None and max_comments <= 0:
+            return
+        yielded = 0
+        page_token = None
+        
+        while True:
+            page_size = MAX_COMMENTS_PER_PAGE
+            if max_comments is not None:
+                page_size = min(page_size, max_comments - yielded)
             
-            comments = []
-            for item in response['items']:
-                comment = item['snippet']['topLevelComment']['snippet']
-                comments.append({
-                    'author': comment['authorDisplayName'],
-                    'text': comment['textDisplay'],
-                    'like_count': comment['likeCount'],
-                    'published_at': comment['publishedAt']
-                })
+            try:
+                response = self._execute(
+                    'commentThreads.list',
+                    part='snippet,replies' if include_replies else 'snippet',
+                    fields=self.field_masks['comments'],
+                    videoId=video_id,
+                    maxResults=page_size,
+                    order=order,
+                    pageToken=page_token
+                )
+            except HttpError as e:
+                print(f"Error fetching comments: {e}")
+                return
             
-            return comments
-        except HttpError as e:
-            print(f"Error fetching comments: {e}")
-            return []
+            for item in response.get('items', []):
+                top_level = item['snippet']['topLevelComment']
+                comments = [self._parse_comment(top_level)]
+                if include_replies and item['snippet'].get('totalReplyCount', 0):
+                    comments = itertools.chain(comments, self._iter_replies(item))
+                
+                for comment in comments:
+                    yield comment
+                    yielded += 1
+                    if max_comments is not None and yielded >= max_comments:
+                        return
+            
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
     
-    def search_trending_videos(self, region_code: str = 'US', max_results: int = 50) -> List[Dict]:
-        """Get trending videos"""
-        try:
-            response = self.youtube.videos().list(
-                part='snippet,statistics',
-                chart='mostPopular',
-                regionCode=region_code,
-                maxResults=max_results
-            ).execute()
+    def _iter_replies(self, thread: Dict) -> Iterator[Dict]:
+        """Yield all replies of a comment thread"""
+        embedded = thread.get('replies', {}).get('comments', [])
+        if len(embedded) >= thread['snippet']['totalReplyCount']:
+            for reply in embedded:
+                yield self._parse_comment(reply)
+            return
+        
+        page_token = None
+        while True:
+            try:
+                response = self._execute(
+                    'comments.list',
+                    part='snippet',
+                    fields=self.field_masks['comment_replies'],
+                    parentId=thread['snippet']['topLevelComment']['id'],
+                    maxResults=MAX_COMMENTS_PER_PAGE,
+                    pageToken=page_token
+                )
+            except HttpError as e:
+                print(f"Error fetching comment replies: {e}")
+                return
             
-            videos = []
-            for item in response['items']:
-                video_data = {
-                    'video_id': item['id'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'view_count': int(item['statistics'].get('viewCount', 0)),
-                    'like_count': int(item['statistics'].get('likeCount', 0)),
-                    'comment_count': int(item['statistics'].get('commentCount', 0)),
-                    'tags': item['snippet'].get('tags', [])
-                }
-                videos.append(video_data)
+            for reply in response.get('items', []):
+                yield self._parse_comment(reply)
             
-            return videos
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def _parse_comment(self, comment: Dict) -> Dict:
+        """Convert a comment resource into the comment dict used by callers"""
+        snippet = comment['snippet']
+        return {
+            'comment_id': comment.get('id'),
+            'parent_id': snippet.get('parentId'),
+            'author': snippet['authorDisplayName'],
+            'text': snippet['textDisplay'],
+            'like_count': snippet['likeCount'],
+            'published_at': snippet['publishedAt']
+        }
+    
+    def search_trending_videos(self, region_code: str = 'US', max_results: int = 50) -> List[Dict]:
+        """Get trending videos
+        
+        Follows nextPageToken beyond the 50-per-page limit. When the monitor
+        has a snapshot_store, the statistics are also appended to it; cached
+        pages are then revalidated first (an unchanged chart costs a 304)
+        so every snapshot holds the counts current at its timestamp.
+        """
+        recording = self.snapshot_store is not None
+        videos = []
+        page_token = None
+        try:
+            while len(videos) < max_results:
+                response = self._execute(
+                    'videos.list',
+                    revalidate=recording,
+                    part='snippet,statistics',
+                    fields=self.field_masks['trending'],
+                    chart='mostPopular',
+                    regionCode=region_code,
+                    maxResults=min(MAX_RESULTS_PER_PAGE, max_results - len(videos)),
+                    pageToken=page_token
+                )
+                
+                for item in response['items']:
+                    video_data = {
+                        'video_id': item['id'],
+                        'title': item['snippet']['title'],
+                        'description': item['snippet']['description'],
+                        'published_at': item['snippet']['publishedAt'],
+                        'view_count': int(item['statistics'].get('viewCount', 0)),
+                        'like_count': int(item['statistics'].get('likeCount', 0)),
+                        'comment_count': int(item['statistics'].get('commentCount', 0)),
+                        'tags': item['snippet'].get('tags', [])
+                    }
+                    videos.append(video_data)
+                
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
         except HttpError as e:
             print(f"Error fetching trending videos: {e}")
-            return []
+            if not videos:
+                return []
+        
+        videos = videos[:max_results]
+        if recording:
+            self.snapshot_store.record(videos, region=region_code, source='trending')
+        return videos
+    
+    def iter_search_videos(self, query: str, max_results: Optional[int] = None,
+                           order: str = 'relevance', window_hours: Optional[float] = None,
+                           published_after: Optional[Union[str, datetime]] = None,
+                           published_before: Optional[Union[str, datetime]] = None,
+                           region_code: Optional[str] = None,
+                           channel_id: Optional[str] = None) -> Iterator[Dict]:
+        """Lazily yield videos matching a search, page by page, without duplicates.
+        
+        search.list costs 100 units per page, so pages are only requested as
+        the caller consumes results and go through the response cache. A
+        relative window_hours is aligned to SEARCH_WINDOW_ALIGN_MINUTES, so
+        dashboard refreshes reuse the cached pages instead of re-spending quota.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        if window_hours is not None and published_after is None:
+            published_after = _aligned_now() - timedelta(hours=window_hours)
+        
+        seen = set()
+        page_token = None
+        while True:
+            page_size = MAX_RESULTS_PER_PAGE
+            if max_results is not None:
+                page_size = min(page_size, max_results - len(seen))
+            
+            try:
+                response = self._execute(
+                    'search.list',
+                    part='id,snippet',
+                    fields=self.field_masks['search'],
+                    q=query,
+                    type='video',
+                    order=order,
+                    maxResults=page_size,
+                    publishedAfter=_format_timestamp(published_after),
+                    publishedBefore=_format_timestamp(published_before),
+                    regionCode=region_code,
+                    channelId=channel_id,
+                    pageToken=page_token
+                )
+            except HttpError as e:
+                print(f"Error searching videos: {e}")
+                return
+            
+            for item in response.get('items', []):
+                video = self._parse_search_item(item)
+                # Results shift between pages as the index updates
+                if video['video_id'] in seen:
+                    continue
+                seen.add(video['video_id'])
+                yield video
+                if max_results is not None and len(seen) >= max_results:
+                    return
+            
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def search_videos(self, query: str, max_results: int = 50, **filters) -> List[Dict]:
+        """Search videos; see iter_search_videos for the filters"""
+        return list(self.iter_search_videos(query, max_results=max_results, **filters))
+    
+    def search_new_videos(self, query: str, max_results: int = 50,
+                          overlap_minutes: int = WATERMARK_OVERLAP_MINUTES, **filters) -> List[Dict]:
+        """Run a saved search and return only videos not returned by earlier runs.
+        
+        Each (query, filters) pair is a saved search in the state store with
+        its own publish-time watermark: later runs ask for newest-first
+        results published after the watermark (minus an overlap), and the
+        store drops anything already reported.
+        """
+        saved = self.state_store.get_saved_search(query, filters)
+        if saved.get('watermark'):
+            cutoff = _parse_timestamp(saved['watermark']) - timedelta(minutes=overlap_minutes)
+            incremental = dict(filters, order='date', published_after=cutoff, window_hours=None)
+            videos = self.search_videos(query, max_results=max_results, **incremental)
+        else:
+            videos = self.search_videos(query, max_results=max_results, **filters)
+        
+        return self.state_store.record_search_results(query, filters, videos)
+    
+    def get_new_channel_videos(self, channel_id: str, max_videos: int = MAX_RESULTS_PER_PAGE,
+                               overlap_minutes: int = WATERMARK_OVERLAP_MINUTES) -> List[Dict]:
+        """Fetch only uploads newer than the channel's stored watermark.
+        
+        The watermark is the latest publish time seen for the channel. Items
+        published up to overlap_minutes before it are fetched again so that
+        late-arriving or backdated uploads are not missed; the state store
+        filters out the ones already known. Without a watermark this is the
+        latest max_videos uploads. Pages are revalidated with If-None-Match,
+        so a poll with nothing new is a small page or a bodiless 304.
+        """
+        watermark = self.state_store.get_channel(channel_id).get('watermark')
+        if not watermark:
+            return list(self.iter_channel_uploads(channel_id, max_videos=max_videos, revalidate=True))
+        
+        cutoff = _parse_timestamp(watermark) - timedelta(minutes=overlap_minutes)
+        return list(self.iter_channel_uploads(
+            channel_id,
+            max_videos=max_videos,
+            published_after=cutoff,
+            page_size=INCREMENTAL_PAGE_SIZE,
+            revalidate=True
+        ))
     
     def monitor_channel_activity(self, channel_id: str, interval_minutes: int = 60) -> Dict:
-        """Monitor channel for new activity"""
-        current_videos = self.get_channel_videos(channel_id)
+        """Monitor channel for new activity
         
-        # Load previous state if exists
+        Only uploads newer than the channel's watermark (minus a small
+        overlap) are fetched, through the uploads playlist. interval_minutes
+        is stored as the channel's polling interval and determines next_check.
+        """
+        # Import the legacy JSON state the first time a channel is seen
         state_file = f"channel_state_{channel_id}.json"
-        previous_videos = []
+        if os.path.exists(state_file) and not self.state_store.has_channel(channel_id):
+            self.state_store.migrate_json_state(state_file, channel_id)
         
-        if os.path.exists(state_file):
-            with open(state_file, 'r') as f:
-                previous_data = json.load(f)
-                previous_videos = previous_data.get('videos', [])
+        current_videos = self.get_new_channel_videos(channel_id)
         
-        # Find new videos
-        previous_ids = {v['video_id'] for v in previous_videos}
-        new_videos = [v for v in current_videos if v['video_id'] not in previous_ids]
+        # Find new videos and update state in one transaction
+        now = datetime.now()
+        last_check = now.isoformat()
+        new_videos = self.state_store.record_videos(channel_id, current_videos, checked_at=last_check)
         
-        # Update state
-        with open(state_file, 'w') as f:
-            json.dump({'videos': current_videos, 'last_check': datetime.now().isoformat()}, f)
+        next_check = (now + timedelta(minutes=interval_minutes)).isoformat()
+        self.state_store.set_schedule(channel_id, interval_minutes, next_check)
         
         return {
             'new_videos': new_videos,
-            'total_videos': len(current_videos),
-            'last_check': datetime.now().isoformat()
+            'total_videos': self.state_store.count_videos(channel_id),
+            'last_check': last_check,
+            'next_check': next_check
         }